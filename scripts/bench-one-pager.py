@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Lighten AI one-pager generator.
+
+    python scripts/bench-one-pager.py --save        # record a baseline
+    python scripts/bench-one-pager.py               # compare, exit 1 on regression
+"""
+
+import sys
+
+from one_pager.bench import main
+
+if __name__ == "__main__":
+    sys.exit(main())
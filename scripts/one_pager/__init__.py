@@ -0,0 +1,65 @@
+"""
+Lighten AI one-pager generator.
+
+spec.py loads and validates the page copy, fonts.py registers its TrueType
+typeface if it names one, layout.py turns it into an immutable tree of
+positioned drawing items, render.py emits that tree to a reportlab canvas
+(images.py downsamples the raster images it places, optimize.py shrinks the
+result, linearize.py reorders it for fast web view, reproducible.py makes it
+byte-identical for identical input and gives its ETag) or, through backends.py,
+to SVG and PNG previews (preview.py), batch.py fans renders out across worker
+processes, archive.py streams batch output into a ZIP or tar, service.py
+serves renders over local HTTP and watch.py re-renders in place as the spec
+or the layout code is edited.
+scripts/create-one-pager.py is the command-line entry.
+
+Names are imported on first access, so importing the package (or only
+spec/layout) does not pay for reportlab.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    "FitError": "layout",
+    "FontRegistry": "fonts",
+    "ImageCache": "images",
+    "OUTPUT_PATH": "render",
+    "Optimize": "optimize",
+    "Preview": "preview",
+    "Probe": "instrument",
+    "RasterCanvas": "backends",
+    "SpecError": "spec",
+    "SvgCanvas": "backends",
+    "create_combined": "render",
+    "create_one_pager": "render",
+    "default_spec": "spec",
+    "draw_preview": "preview",
+    "etag": "reproducible",
+    "layout_page": "layout",
+    "load_spec": "spec",
+    "render_archive": "archive",
+    "render_batch": "batch",
+    "render_combined": "batch",
+    "render_page": "render",
+    "render_previews": "preview",
+    "render_stream": "batch",
+    "run_pipeline": "batch",
+    "string_width": "metrics",
+    "wrap_text": "metrics",
+    "write_previews": "preview",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,158 @@
+"""
+Streaming archive output for batch runs.
+
+Instead of loose files, render_archive() writes every PDF straight into one
+ZIP or tar stream as the pipeline produces it (see batch.run_pipeline), to a
+file or to stdout, with no intermediate files. The last member is
+manifest.jsonl, one line per document:
+
+    {"index": 0, "name": "00000-acme.pdf", "sha256": "...", "bytes": 10211, "render_ms": 21.4, "cached": null}
+
+Manifest lines are spooled to a temporary file while the run goes, so memory
+stays flat however many documents the archive holds. In a tar, a document
+identical to an earlier one (same sha256) is stored once, as a hard link to
+the first copy.
+
+With Optimize.reproducible the archive itself is reproducible too: member and
+gzip timestamps are pinned to reproducible.source_date() and the manifest
+leaves out render_ms and cached, so the same leads give the same archive bytes.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+
+from .batch import run_pipeline
+from .cache import DEFAULT_MAX_BYTES
+from .leads import read_leads
+from .reproducible import source_date
+
+ARCHIVE_FORMATS = {".zip": "zip", ".tar": "tar", ".tar.gz": "tar.gz", ".tgz": "tar.gz"}
+MANIFEST_NAME = "manifest.jsonl"
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)  # earliest date a ZIP entry can carry
+
+
+def archive_format(path, default="zip"):
+    """Archive format named by path's extension ("zip", "tar" or "tar.gz"); default for stdout."""
+    for ext, fmt in ARCHIVE_FORMATS.items():
+        if path.endswith(ext):
+            return fmt
+    if path == "-":
+        return default
+    raise ValueError(f"Can't tell the archive format of {path!r}; use one of {', '.join(ARCHIVE_FORMATS)}")
+
+
+class ArchiveWriter:
+    """
+    Sink appending each rendered PDF to a ZIP or tar stream.
+
+    output is a path or a binary stream, which may be unseekable (a pipe,
+    stdout): ZIP members then carry data descriptors and tar is written in
+    stream mode. PDFs are deflated inside ZIPs, since reportlab's
+    ASCII85-wrapped streams still compress well. mtime (a Unix time) pins
+    every timestamp written; None stamps the current time.
+    """
+
+    def __init__(self, output, fmt="zip", compression=zipfile.ZIP_DEFLATED, mtime=None):
+        if fmt not in ARCHIVE_FORMATS.values():
+            raise ValueError(f"Unknown archive format {fmt!r}")
+        self.fmt = fmt
+        self.mtime = mtime
+        self.count = 0
+        self._owned = not hasattr(output, "write")
+        self._file = open(output, "wb") if self._owned else output
+        self._manifest = tempfile.TemporaryFile()
+        self._stored = {}  # sha256 -> name of the tar member holding those bytes
+        self._gzip = None
+        if fmt == "zip":
+            self._archive = zipfile.ZipFile(self._file, "w", compression)
+        else:
+            # tarfile's own "w|gz" stamps the gzip header with the current time and the file name.
+            if fmt == "tar.gz":
+                self._gzip = gzip.GzipFile("", "wb", fileobj=self._file, mtime=mtime)
+            self._archive = tarfile.open(fileobj=self._gzip or self._file, mode="w|")
+
+    def _add(self, name, fileobj, size, sha256=None):
+        """Append fileobj's size bytes as member name; in a tar, link to an earlier member with the same sha256."""
+        now = time.time() if self.mtime is None else self.mtime
+        if self.fmt == "zip":
+            date_time = (time.localtime(now) if self.mtime is None else time.gmtime(now))[:6]
+            date_time = max(date_time, ZIP_EPOCH)  # ZIP dates start at 1980; SOURCE_DATE_EPOCH is often 0
+            info = zipfile.ZipInfo(name, date_time)
+            info.compress_type = self._archive.compression
+            info.external_attr = 0o644 << 16
+            info.file_size = size
+            with self._archive.open(info, "w") as dest:
+                shutil.copyfileobj(fileobj, dest)
+        else:
+            info = tarfile.TarInfo(name)
+            info.mtime = int(now)
+            info.mode = 0o644
+            first = self._stored.get(sha256)
+            if first is not None:
+                info.type = tarfile.LNKTYPE
+                info.linkname = first
+                self._archive.addfile(info)
+                return
+            if sha256 is not None:
+                self._stored[sha256] = name
+            info.size = size
+            self._archive.addfile(info, fileobj)
+
+    def __call__(self, rendered):
+        """Sink interface for batch.run_pipeline: add one Rendered and its manifest line."""
+        sha256 = hashlib.sha256(rendered.data).hexdigest()
+        self._add(rendered.name, io.BytesIO(rendered.data), len(rendered.data), sha256)
+        entry = {
+            "index": rendered.index,
+            "name": rendered.name,
+            "sha256": sha256,
+            "bytes": len(rendered.data),
+        }
+        if self.mtime is None:
+            entry.update(render_ms=round(rendered.seconds * 1000, 3), cached=rendered.hit)
+        self._manifest.write(json.dumps(entry).encode() + b"\n")
+        self.count += 1
+
+    def close(self):
+        """Append the manifest and finish the archive."""
+        size = self._manifest.tell()
+        self._manifest.seek(0)
+        self._add(MANIFEST_NAME, self._manifest, size)
+        self._manifest.close()
+        self._archive.close()
+        if self._gzip is not None:
+            self._gzip.close()
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def render_archive(leads_path, output, fmt=None, dead_letter=None, workers=None, chunk_size=32, cache_dir=None,
+                   cache_bytes=DEFAULT_MAX_BYTES, probe=None, spec=None, optimize=None):
+    """
+    Render one one-pager per lead in leads_path into a single ZIP or tar archive.
+
+    output is a path (format from its extension unless fmt is given) or a
+    binary stream such as sys.stdout.buffer (ZIP unless fmt is given). Other
+    arguments are as for batch.run_pipeline(). Returns a BatchResult.
+    """
+    if fmt is None:
+        fmt = archive_format(output if isinstance(output, str) else "-")
+    mtime = source_date() if optimize and optimize.reproducible else None
+    with ArchiveWriter(output, fmt, mtime=mtime) as archive:
+        return run_pipeline(read_leads(leads_path), archive, dead_letter, workers, chunk_size, cache_dir,
+                            cache_bytes, probe, spec, optimize=optimize)
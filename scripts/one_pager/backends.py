@@ -0,0 +1,404 @@
+"""
+Drawing backends besides reportlab's PDF canvas: SVG documents and Pillow images.
+
+render.py's draw helpers only use a small part of reportlab's canvas API, and
+that part is the drawing backend interface:
+
+    setFillColor(color, alpha=None)   setStrokeColor(color, alpha=None)
+    setLineWidth(width)   setDash(array=(), phase=0)   saveState()   restoreState()
+    rect(x, y, w, h, stroke, fill)   circle(x, y, r, stroke, fill)   line(x1, y1, x2, y2)
+    beginPath() -> path with moveTo/lineTo/curveTo/roundRect/close
+    drawPath(path, stroke, fill)   drawImage(path, x, y, w, h, mask, preserveAspectRatio)
+    text_run() -> object with add(x, y, text, font, size, color) and draw()
+
+text_run() stands in for reportlab's text objects: render.text_run() gives a
+reportlab canvas a TextRun and any other backend its own. Coordinates are PDF
+points with the origin at the bottom left and colors are reportlab Colors
+(theme RGBAs for text runs), so render_block() draws a laid-out Block onto
+SvgCanvas or RasterCanvas exactly as it does onto a PDF page.
+
+Text is set in the fonts layout measured with when the target has them (the
+spec's TrueType files, the same for PNG and as named families for SVG) and
+otherwise in a stand-in: Helvetica is not shipped with Python, so PNGs use
+reportlab's bundled Vera. Each span is then stretched or squeezed to its
+measured width, so lines break and align as they do in the PDF.
+"""
+
+from base64 import b64encode
+from functools import lru_cache
+import io
+from itertools import groupby
+from math import ceil, hypot
+import os
+import re
+from xml.sax.saxutils import escape, quoteattr
+
+from .fonts import HELVETICA, REGISTRY
+from .metrics import string_width
+from .theme import RGBA
+
+SUPERSAMPLE = 2  # RasterCanvas paints at this multiple of its size, then downsamples, to anti-alias shapes
+CURVE_STEPS = 16  # line segments per Bezier curve when rasterizing
+# reportlab's bundled stand-ins for the built-in faces, for rasterizing text
+VERA = {"Helvetica": "Vera.ttf", "Helvetica-Bold": "VeraBd.ttf", "Helvetica-Oblique": "VeraIt.ttf",
+        "Helvetica-BoldOblique": "VeraBI.ttf"}
+# Wide-coverage system fonts for characters a face has no glyph for (arrows, dingbats); first found wins.
+FALLBACK_FONTS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "C:\\Windows\\Fonts\\seguisym.ttf",
+)
+_SPACES = re.compile(r"^ | $|(?<= ) ")
+_KAPPA_GAP = 0.4477152502  # 1 - 4/3 (sqrt(2) - 1): corner-to-control-point offset of a quarter circle, per radius
+
+
+def _number(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".") or "0"
+
+
+def _rgba(color, alpha):
+    """(r, g, b, a) in 0..1 for a reportlab Color or theme RGBA, with alpha overriding the color's own."""
+    if isinstance(color, RGBA):
+        return color if alpha is None else color._replace(a=alpha)
+    if alpha is None:
+        alpha = getattr(color, "alpha", 1)
+    return color.red, color.green, color.blue, alpha
+
+
+class Path:
+    """beginPath() result: (op, coordinates) pairs, op being M, L, C (cubic Bezier) or Z."""
+
+    def __init__(self):
+        self.ops = []
+
+    def moveTo(self, x, y):
+        self.ops.append(("M", (x, y)))
+
+    def lineTo(self, x, y):
+        self.ops.append(("L", (x, y)))
+
+    def curveTo(self, x1, y1, x2, y2, x3, y3):
+        self.ops.append(("C", (x1, y1, x2, y2, x3, y3)))
+
+    def close(self):
+        self.ops.append(("Z", ()))
+
+    def roundRect(self, x, y, width, height, radius):
+        r = min(radius, width / 2, height / 2)
+        m = _KAPPA_GAP * r
+        right, top = x + width, y + height
+        self.moveTo(x + r, y)
+        self.lineTo(right - r, y)
+        self.curveTo(right - m, y, right, y + m, right, y + r)
+        self.lineTo(right, top - r)
+        self.curveTo(right, top - m, right - m, top, right - r, top)
+        self.lineTo(x + r, top)
+        self.curveTo(x + m, top, x, top - m, x, top - r)
+        self.lineTo(x, y + r)
+        self.curveTo(x, y + m, x + m, y, x + r, y)
+        self.close()
+
+
+class _TextRun:
+    """text_run() result: spans collected by add() and handed to the backend by draw()."""
+
+    def __init__(self, backend):
+        self._backend = backend
+        self._spans = []
+
+    def add(self, x, y, text, font_name, font_size, color):
+        self._spans.append((x, y, text, font_name, font_size, color))
+
+    def draw(self):
+        for span in self._spans:
+            self._backend.draw_text(*span)
+        self._spans = []
+
+
+class _Backend:
+    """Graphics state shared by the backends: colors, line width and dash, with a save/restore stack."""
+
+    def __init__(self, width, height, typeface=HELVETICA):
+        self.width = width
+        self.height = height
+        self.typeface = typeface
+        self._fill = (0, 0, 0, 1)
+        self._stroke = (0, 0, 0, 1)
+        self._line_width = 1
+        self._dash = ()
+        self._stack = []
+
+    def setFillColor(self, color, alpha=None):
+        self._fill = _rgba(color, alpha)
+
+    def setStrokeColor(self, color, alpha=None):
+        self._stroke = _rgba(color, alpha)
+
+    def setLineWidth(self, width):
+        self._line_width = width
+
+    def setDash(self, array=(), phase=0):
+        self._dash = (array, phase) if isinstance(array, (int, float)) else tuple(array)
+
+    def saveState(self):
+        self._stack.append((self._fill, self._stroke, self._line_width, self._dash))
+
+    def restoreState(self):
+        self._fill, self._stroke, self._line_width, self._dash = self._stack.pop()
+
+    def beginPath(self):
+        return Path()
+
+    def text_run(self):
+        return _TextRun(self)
+
+    def _bold_italic(self, font_name):
+        face = self.typeface
+        bold = font_name == face.bold or "Bold" in font_name
+        italic = font_name == face.italic or "Oblique" in font_name or "Italic" in font_name
+        return bold, italic
+
+
+class SvgCanvas(_Backend):
+    """Backend collecting SVG elements; getvalue() returns the document."""
+
+    def __init__(self, width, height, typeface=HELVETICA):
+        super().__init__(width, height, typeface)
+        self._elements = []
+
+    def _y(self, y):
+        return _number(self.height - y)
+
+    @staticmethod
+    def _color(attr, rgba):
+        r, g, b, a = rgba
+        paint = f'{attr}="#{round(r * 255):02x}{round(g * 255):02x}{round(b * 255):02x}"'
+        return paint if a == 1 else f'{paint} {attr}-opacity="{_number(a)}"'
+
+    def _paint(self, stroke, fill):
+        attrs = [self._color("fill", self._fill) if fill else 'fill="none"']
+        if stroke:
+            attrs.append(self._color("stroke", self._stroke))
+            attrs.append(f'stroke-width="{_number(self._line_width)}"')
+            if self._dash:
+                attrs.append(f'stroke-dasharray="{" ".join(_number(d) for d in self._dash)}"')
+        return " ".join(attrs)
+
+    def rect(self, x, y, width, height, stroke=1, fill=0):
+        self._elements.append(f'<rect x="{_number(x)}" y="{self._y(y + height)}" width="{_number(width)}" '
+                              f'height="{_number(height)}" {self._paint(stroke, fill)}/>')
+
+    def circle(self, x_cen, y_cen, r, stroke=1, fill=0):
+        self._elements.append(f'<circle cx="{_number(x_cen)}" cy="{self._y(y_cen)}" r="{_number(r)}" '
+                              f'{self._paint(stroke, fill)}/>')
+
+    def line(self, x1, y1, x2, y2):
+        self._elements.append(f'<line x1="{_number(x1)}" y1="{self._y(y1)}" x2="{_number(x2)}" y2="{self._y(y2)}" '
+                              f'{self._paint(1, 0)}/>')
+
+    def drawPath(self, aPath, stroke=1, fill=0, fillMode=None):
+        d = []
+        for op, coords in aPath.ops:
+            points = " ".join(f"{_number(x)} {self._y(y)}" for x, y in zip(coords[::2], coords[1::2]))
+            d.append(f"{op}{points}")
+        self._elements.append(f'<path d="{" ".join(d)}" fill-rule="evenodd" {self._paint(stroke, fill)}/>')
+
+    def drawImage(self, image, x, y, width=None, height=None, mask=None, preserveAspectRatio=False, anchor="c"):
+        mime = "image/png" if image.lower().endswith(".png") else "image/jpeg"
+        with open(image, "rb") as f:
+            data = b64encode(f.read()).decode("ascii")
+        fit = "xMidYMid meet" if preserveAspectRatio else "none"
+        self._elements.append(f'<image x="{_number(x)}" y="{self._y(y + height)}" width="{_number(width)}" '
+                              f'height="{_number(height)}" preserveAspectRatio="{fit}" '
+                              f'href="data:{mime};base64,{data}"/>')
+
+    def _family(self, font_name):
+        if font_name.startswith("Helvetica"):
+            return "Helvetica, Arial, sans-serif"
+        stem = font_name.rsplit("-", 1)[0]  # registered fonts are "<file stem>-<digest prefix>"
+        return f"'{stem}', Helvetica, Arial, sans-serif"
+
+    def draw_text(self, x, y, text, font_name, font_size, color):
+        bold, italic = self._bold_italic(font_name)
+        attrs = [f'x="{_number(x)}" y="{self._y(y)}"', f"font-family={quoteattr(self._family(font_name))}",
+                 f'font-size="{_number(font_size)}"', self._color("fill", _rgba(color, None))]
+        if bold:
+            attrs.append('font-weight="bold"')
+        if italic:
+            attrs.append('font-style="italic"')
+        width = string_width(text, font_name, font_size)
+        if width > 0:
+            attrs.append(f'textLength="{_number(width)}" lengthAdjust="spacingAndGlyphs"')
+        text = _SPACES.sub("\u00a0", text)  # SVG collapses leading, trailing and repeated spaces
+        self._elements.append(f'<text {" ".join(attrs)}>{escape(text)}</text>')
+
+    def getvalue(self):
+        w, h = _number(self.width), _number(self.height)
+        return "\n".join([
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}pt" height="{h}pt" viewBox="0 0 {w} {h}">',
+            *self._elements,
+            "</svg>",
+            "",
+        ])
+
+
+@lru_cache(maxsize=256)
+def _pil_font(path, size):
+    from PIL import ImageFont
+
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=None)
+def _raster_face(font_name):
+    """(TrueType file, characters it has glyphs for) to rasterize font_name: the font itself, else Vera."""
+    path = REGISTRY.path(font_name)
+    if path is None:
+        import reportlab
+
+        path = os.path.join(os.path.dirname(reportlab.__file__), "fonts", VERA.get(font_name, "Vera.ttf"))
+        font_name = REGISTRY.register(path)  # for its glyph coverage, parsed once per machine
+    return path, frozenset(REGISTRY.widths(font_name)[0])
+
+
+@lru_cache(maxsize=None)
+def _fallback_font():
+    return next((path for path in FALLBACK_FONTS if os.path.exists(path)), None)
+
+
+def _segments(text, font_name):
+    """text as (substring, font file) runs, switching to the fallback font for characters the face lacks."""
+    path, covered = _raster_face(font_name)
+    fallback = _fallback_font()
+    if fallback is None or all(ch in covered for ch in text):
+        return [(text, path)]
+    return [("".join(chars), path if has else fallback)
+            for has, chars in groupby(text, lambda ch: ch in covered or ch.isspace())]
+
+
+def _flatten(p0, c1, c2, p3):
+    """Points along a cubic Bezier after p0, as CURVE_STEPS line segments."""
+    points = []
+    for i in range(1, CURVE_STEPS + 1):
+        t = i / CURVE_STEPS
+        u = 1 - t
+        a, b, c, d = u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t
+        points.append((a * p0[0] + b * c1[0] + c * c2[0] + d * p3[0], a * p0[1] + b * c1[1] + c * c2[1] + d * p3[1]))
+    return points
+
+
+class RasterCanvas(_Backend):
+    """Backend painting into a Pillow image at dpi; png() returns the encoded image."""
+
+    def __init__(self, width, height, dpi=72, typeface=HELVETICA):
+        from PIL import Image, ImageDraw
+
+        super().__init__(width, height, typeface)
+        self.dpi = dpi
+        self._scale = dpi / 72 * SUPERSAMPLE
+        self._image = Image.new("RGB", (ceil(width * self._scale), ceil(height * self._scale)), "white")
+        self._draw = ImageDraw.Draw(self._image, "RGBA")  # RGBA colors blend over what is already painted
+
+    def _xy(self, x, y):
+        return x * self._scale, (self.height - y) * self._scale
+
+    @staticmethod
+    def _color(rgba):
+        return tuple(round(v * 255) for v in rgba)
+
+    def _pen(self):
+        return max(1, round(self._line_width * self._scale))
+
+    def _box(self, x, y, width, height):
+        (x0, y0), (x1, y1) = self._xy(x, y + height), self._xy(x + width, y)
+        return [min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)]
+
+    def rect(self, x, y, width, height, stroke=1, fill=0):
+        self._draw.rectangle(self._box(x, y, width, height), fill=self._color(self._fill) if fill else None,
+                             outline=self._color(self._stroke) if stroke else None, width=self._pen())
+
+    def circle(self, x_cen, y_cen, r, stroke=1, fill=0):
+        self._draw.ellipse(self._box(x_cen - r, y_cen - r, 2 * r, 2 * r),
+                           fill=self._color(self._fill) if fill else None,
+                           outline=self._color(self._stroke) if stroke else None, width=self._pen())
+
+    def line(self, x1, y1, x2, y2):
+        start, end = self._xy(x1, y1), self._xy(x2, y2)
+        color, pen = self._color(self._stroke), self._pen()
+        dash = [d * self._scale for d in self._dash if d > 0]
+        if not dash:
+            self._draw.line([start, end], fill=color, width=pen)
+            return
+        length = hypot(end[0] - start[0], end[1] - start[1])
+        if not length:  # no direction to dash along; with butt caps a PDF viewer paints nothing either
+            return
+        ux, uy = (end[0] - start[0]) / length, (end[1] - start[1]) / length
+        pos, i = 0.0, 0
+        while pos < length:
+            step = min(dash[i % len(dash)], length - pos)
+            if i % 2 == 0:  # on
+                self._draw.line([(start[0] + ux * pos, start[1] + uy * pos),
+                                 (start[0] + ux * (pos + step), start[1] + uy * (pos + step))], fill=color, width=pen)
+            pos += step
+            i += 1
+
+    def drawPath(self, aPath, stroke=1, fill=0, fillMode=None):
+        subpaths, points, closed = [], [], False
+        for op, coords in aPath.ops:
+            if op == "M":
+                if points:
+                    subpaths.append((points, closed))
+                points, closed = [self._xy(*coords)], False
+            elif op == "L":
+                points.append(self._xy(*coords))
+            elif op == "C":
+                points.extend(_flatten(points[-1], self._xy(*coords[:2]), self._xy(*coords[2:4]),
+                                       self._xy(*coords[4:])))
+            else:
+                closed = True
+        if points:
+            subpaths.append((points, closed))
+        for points, closed in subpaths:
+            if fill and len(points) > 2:
+                self._draw.polygon(points, fill=self._color(self._fill))
+            if stroke:
+                self._draw.line(points + points[:1] if closed else points, fill=self._color(self._stroke),
+                                width=self._pen(), joint="curve")
+
+    def drawImage(self, image, x, y, width=None, height=None, mask=None, preserveAspectRatio=False, anchor="c"):
+        from PIL import Image
+
+        with Image.open(image) as im:
+            im.load()
+        box = self._box(x, y, width, height)
+        box_w, box_h = box[2] - box[0], box[3] - box[1]
+        if preserveAspectRatio:
+            scale = min(box_w / im.width, box_h / im.height)
+            size = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+        else:
+            size = (max(1, round(box_w)), max(1, round(box_h)))
+        im = im.convert("RGBA").resize(size, Image.LANCZOS)
+        left, top = round(box[0] + (box_w - size[0]) / 2), round(box[1] + (box_h - size[1]) / 2)
+        self._image.paste(im, (left, top), im)
+
+    def draw_text(self, x, y, text, font_name, font_size, color):
+        segments = _segments(text, font_name)
+        size = font_size * self._scale
+        natural = sum(_pil_font(path, round(size, 1)).getlength(part) for part, path in segments)
+        target = string_width(text, font_name, font_size) * self._scale
+        if natural > 0 and target > 0:
+            size *= target / natural  # fit the span to its measured width
+        (px, py), fill = self._xy(x, y), self._color(_rgba(color, None))
+        for part, path in segments:
+            font = _pil_font(path, round(size, 1))
+            self._draw.text((px, py), part, font=font, fill=fill, anchor="ls")
+            px += font.getlength(part)
+
+    def png(self):
+        """The image at dpi, downsampled from the supersampled canvas, as PNG bytes."""
+        from PIL import Image
+
+        size = (ceil(self.width * self.dpi / 72), ceil(self.height * self.dpi / 72))
+        buf = io.BytesIO()
+        self._image.resize(size, Image.LANCZOS).save(buf, "PNG")
+        return buf.getvalue()
@@ -0,0 +1,285 @@
+"""
+Batch mode: one personalized one-pager per lead, fanned out across a process pool.
+
+Runs are a streaming pipeline so memory stays flat however long the lead file
+is:
+
+    read_leads()    rows are read lazily, one chunk at a time
+    render_stream() chunks render in worker processes; at most two chunks per
+                    worker are in flight and results come back in input order
+    run_pipeline()  a writer thread hands each PDF to a sink (write a file,
+                    upload, append to an archive) through a bounded queue
+
+A row that fails to parse, lay out, render or reach the sink is appended to
+a dead-letter JSONL file with its error instead of aborting the run; each
+line keeps the original row, so failures can be fixed and re-run.
+"""
+
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import queue
+import threading
+import time
+
+from .cache import DEFAULT_MAX_BYTES, RenderCache, cached_one_pager
+from .fonts import preload
+from .instrument import Probe
+from .layout import layout_page
+from .leads import lead_filename, normalize_lead, read_leads
+from .render import create_combined, create_one_pager, write_pdf
+
+# failed counts every failure; failures keeps the first MAX_REPORTED_FAILURES.
+BatchResult = namedtuple("BatchResult", "rendered failures cache_hits cache_misses probe failed", defaults=(None, 0))
+Rendered = namedtuple("Rendered", "index row name data error hit seconds")  # one per input row
+
+MAX_REPORTED_FAILURES = 100
+WRITE_QUEUE_SIZE = 64  # rendered PDFs waiting for the sink
+
+_worker_caches = {}  # cache_dir -> RenderCache, one per worker process
+
+
+def _worker_cache(cache_dir, cache_bytes):
+    cache = _worker_caches.get(cache_dir)
+    if cache is None:
+        cache = _worker_caches[cache_dir] = RenderCache(cache_dir, cache_bytes)
+    return cache
+
+
+def _render_chunk(jobs, cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES, profile=False, spec=None, optimize=None):
+    """
+    Worker entry point: render a chunk of (index, row) pairs, never raising.
+
+    Returns (results, probe_snapshot) with one (name, data, error, hit, seconds)
+    per job, in order; the snapshot is None unless profile is set.
+    """
+    cache = _worker_cache(cache_dir, cache_bytes) if cache_dir else None
+    probe = Probe() if profile else None
+    results = []
+    for index, row in jobs:
+        start = time.perf_counter()
+        try:
+            lead = normalize_lead(row)
+            if cache:
+                data, hit = cached_one_pager(cache, None, lead, probe, spec, optimize)
+            else:
+                data, hit = create_one_pager(None, lead, probe, spec, optimize=optimize), None
+            results.append((lead_filename(index, lead), data, None, hit, time.perf_counter() - start))
+        except Exception as e:
+            results.append((None, None, f"{type(e).__name__}: {e}", None, time.perf_counter() - start))
+    return results, probe and probe.snapshot()
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def render_stream(rows, workers=None, chunk_size=32, cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES, probe=None,
+                  spec=None, optimize=None, task=_render_chunk):
+    """
+    Yield a Rendered for every row of rows (any iterable of lead dicts), in input order.
+
+    Rows are submitted in chunks so each task amortizes pickling and IPC. At
+    most two chunks per worker are pending; the oldest is always awaited first,
+    so output order matches input and a slow consumer stalls submission rather
+    than piling up PDFs. With cache_dir, unchanged leads are served from a
+    shared RenderCache; with a probe, worker instrumentation is merged into it.
+    The spec's fonts are loaded before the pool starts, so forked workers
+    inherit them instead of each loading its own. optimize is an optional
+    optimize.Optimize applied to every PDF. task is the worker entry point,
+    called like _render_chunk() (preview.py passes one that draws previews).
+    """
+    workers = workers or os.cpu_count() or 1
+    preload(spec)
+    chunks = _chunked(enumerate(rows), chunk_size)
+    pending = deque()  # (chunk, future), oldest first
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            while len(pending) < workers * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.append((chunk, pool.submit(task, chunk, cache_dir, cache_bytes, probe is not None, spec,
+                                                   optimize)))
+            if not pending:
+                return
+            chunk, future = pending.popleft()
+            results, snapshot = future.result()
+            if snapshot:
+                probe.merge(snapshot)
+            for (index, row), (name, data, error, hit, seconds) in zip(chunk, results):
+                yield Rendered(index, row, name, data, error, hit, seconds)
+
+
+def _unchanged(path, data):
+    """Whether the file at path already holds exactly data."""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def directory_sink(out_dir):
+    """
+    Sink writing each PDF to out_dir under its lead_filename().
+
+    A file that already holds the same bytes is left alone, mtime and all, so
+    with reproducible output a re-run only touches the one-pagers that changed
+    and rsync or an upload step skips the rest.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    def sink(rendered):
+        path = os.path.join(out_dir, rendered.name)
+        if not _unchanged(path, rendered.data):
+            write_pdf(rendered.data, path)
+    return sink
+
+
+class DeadLetter:
+    """Append-only JSONL of failed rows: {"index", "error", "row"} per line, flushed as written."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, index, row, error):
+        self._file.write(json.dumps({"index": index, "error": error, "row": row}, ensure_ascii=False, default=str))
+        self._file.write("\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_pipeline(rows, sink, dead_letter=None, workers=None, chunk_size=32, cache_dir=None,
+                 cache_bytes=DEFAULT_MAX_BYTES, probe=None, spec=None, queue_size=WRITE_QUEUE_SIZE, optimize=None,
+                 task=_render_chunk):
+    """
+    Render rows through render_stream() and hand each success to sink(rendered).
+
+    The sink runs on a writer thread fed by a queue of at most queue_size
+    PDFs, so slow I/O (an upload, a network share) overlaps rendering without
+    unbounded buffering. dead_letter is an optional path for failed rows and
+    task the worker entry point handed to render_stream(). Returns a
+    BatchResult.
+    """
+    counts = {"rendered": 0, "failed": 0, "hits": 0, "misses": 0}
+    failures = []
+    letters = DeadLetter(dead_letter) if dead_letter else None
+    handoff = queue.Queue(queue_size)
+    crashed = []
+
+    def fail(rendered, error):
+        counts["failed"] += 1
+        if len(failures) < MAX_REPORTED_FAILURES:
+            failures.append((rendered.index, error))
+        if letters:
+            letters.write(rendered.index, rendered.row, error)
+
+    def write(rendered):
+        if rendered.error:
+            fail(rendered, rendered.error)
+            return
+        try:
+            sink(rendered)
+        except Exception as e:
+            fail(rendered, f"{type(e).__name__}: {e}")
+            return
+        counts["rendered"] += 1
+        if rendered.hit is not None:
+            counts["hits" if rendered.hit else "misses"] += 1
+
+    def writer():
+        try:
+            for rendered in iter(handoff.get, None):
+                write(rendered)
+        except BaseException as e:  # e.g. the dead-letter disk is full
+            crashed.append(e)
+            for _ in iter(handoff.get, None):  # keep draining so the producer never blocks
+                pass
+
+    thread = threading.Thread(target=writer, name="one-pager-writer", daemon=True)
+    thread.start()
+    try:
+        for rendered in render_stream(rows, workers, chunk_size, cache_dir, cache_bytes, probe, spec, optimize,
+                                      task):
+            if crashed:
+                break
+            handoff.put(rendered)
+    finally:
+        handoff.put(None)
+        thread.join()
+        if letters:
+            letters.close()
+    if crashed:
+        raise crashed[0]
+    return BatchResult(counts["rendered"], failures, counts["hits"], counts["misses"], probe, counts["failed"])
+
+
+def render_batch(leads_path, out_dir, workers=None, chunk_size=32, cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES,
+                 probe=None, spec=None, dead_letter=None, optimize=None):
+    """
+    Render one personalized one-pager per lead in leads_path into out_dir.
+
+    See run_pipeline() for the streaming, caching and dead-letter behaviour;
+    spec is an optional spec.Spec shipped to every worker. Returns a
+    BatchResult; failures is a list of (index, error) tuples.
+    """
+    return run_pipeline(read_leads(leads_path), directory_sink(out_dir), dead_letter, workers, chunk_size,
+                        cache_dir, cache_bytes, probe, spec, optimize=optimize)
+
+
+def render_combined(leads_path, output, probe=None, spec=None, dead_letter=None, optimize=None):
+    """
+    Render every lead as a page of a single PDF at output.
+
+    Runs in one process since the pages share one document, so there is no
+    worker pool and no render cache. Leads that fail validation or layout are
+    skipped (and written to dead_letter, if given); when none is left, output
+    is not written. Returns a BatchResult like render_batch().
+    """
+    rendered, failed, failures = 0, 0, []
+    letters = DeadLetter(dead_letter) if dead_letter else None
+
+    def pages():
+        nonlocal rendered, failed
+        for index, row in enumerate(read_leads(leads_path)):
+            try:
+                page = layout_page(normalize_lead(row), probe, spec)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                failed += 1
+                if len(failures) < MAX_REPORTED_FAILURES:
+                    failures.append((index, error))
+                if letters:
+                    letters.write(index, row, error)
+                continue
+            rendered += 1
+            yield page
+
+    try:
+        data = create_combined(pages(), None, probe, optimize=optimize)
+        if rendered:
+            write_pdf(data, output)
+    finally:
+        if letters:
+            letters.close()
+    return BatchResult(rendered, failures, 0, 0, probe, failed)
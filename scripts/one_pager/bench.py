@@ -0,0 +1,224 @@
+"""
+Benchmarks for the one-pager generator.
+
+Each metric is recorded as {"value", "unit", "better"} where better is "lower"
+or "higher". Results can be saved as a JSON baseline and later runs compared
+against it; any metric that is worse than the baseline by more than the
+threshold counts as a regression.
+"""
+
+from statistics import median
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from .batch import render_batch
+from .metrics import clear_caches, wrap_text
+from .render import create_one_pager, draw_text_wrapped
+from .spec import default_spec
+from .theme import CONTENT_WIDTH, TEXT_MUTED
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARAGRAPH_WORDS = (25, 50, 100, 200)
+SAMPLE_LEAD = {
+    "brand_name": "Northwind Goods",
+    "founder": "Avery Chen",
+    "store_url": "northwindgoods.com",
+    "headline": "Scale Northwind With AI.",
+    "stats": [["4x", "Listings / Week"], ["60%", "Fewer Tickets"], ["24/7", "Support"], ["$0", "New Hires"]],
+}
+
+
+def _paragraph(n_words):
+    """Realistic copy of n_words, cycled from the page's own paragraphs."""
+    spec = default_spec()
+    corpus = " ".join([spec.hero.subtext, spec.problem.text] + [system.desc for system in spec.systems.items]).split()
+    return " ".join(corpus[i % len(corpus)] for i in range(n_words))
+
+
+def _timed(fn, repeat):
+    """Median seconds per call over repeat calls."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return median(samples)
+
+
+def _metric(value, unit, better="lower"):
+    return {"value": round(value, 4), "unit": unit, "better": better}
+
+
+def bench_text(repeat):
+    results = {}
+    c = canvas.Canvas(None, pagesize=letter)
+    for n in PARAGRAPH_WORDS:
+        text = _paragraph(n)
+        loops = max(1, 2000 // n)
+
+        def wrap_cold():
+            clear_caches()
+            wrap_text(text, CONTENT_WIDTH, "Helvetica", 7.5)
+
+        def wrap_warm():
+            for _ in range(loops):
+                wrap_text(text, CONTENT_WIDTH, "Helvetica", 7.5)
+
+        def draw():
+            for _ in range(loops):
+                draw_text_wrapped(c, text, 36, 700, CONTENT_WIDTH, "Helvetica", 7.5, TEXT_MUTED, leading=10)
+
+        results[f"wrap_text_cold_{n}w"] = _metric(n / _timed(wrap_cold, repeat), "words/s", "higher")
+        results[f"wrap_text_warm_{n}w"] = _metric(n * loops / _timed(wrap_warm, repeat), "words/s", "higher")
+        results[f"draw_text_wrapped_{n}w"] = _metric(n * loops / _timed(draw, repeat), "words/s", "higher")
+    return results
+
+
+def bench_render(repeat):
+    create_one_pager(None, SAMPLE_LEAD)  # warm caches
+    warm = _timed(lambda: create_one_pager(None, SAMPLE_LEAD), repeat)
+    full = _timed(lambda: create_one_pager(None, SAMPLE_LEAD, fragments=None), repeat)
+    variants = iter(range(repeat))
+    variant = _timed(lambda: create_one_pager(None, dict(SAMPLE_LEAD, headline=f"Headline {next(variants)}")), repeat)
+
+    tracemalloc.start()
+    data = create_one_pager(None, SAMPLE_LEAD)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "render_warm_ms": _metric(warm * 1000, "ms"),
+        "render_no_fragments_ms": _metric(full * 1000, "ms"),
+        "render_headline_variant_ms": _metric(variant * 1000, "ms"),
+        "render_peak_kb": _metric(peak / 1024, "KB"),
+        "output_kb": _metric(len(data) / 1024, "KB"),
+    }
+
+
+COLD_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {scripts!r})
+from one_pager import create_one_pager
+imported = time.perf_counter()
+create_one_pager(None, json.loads({lead!r}))
+done = time.perf_counter()
+print(json.dumps({{"import": imported - start, "render": done - imported,
+                  "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+
+def bench_cold(repeat):
+    """Fresh interpreter per sample: import + first render, and whole process wall time."""
+    code = COLD_SCRIPT.format(scripts=SCRIPTS_DIR, lead=json.dumps(SAMPLE_LEAD))
+    walls, imports, renders, rss = [], [], [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        walls.append(time.perf_counter() - start)
+        sample = json.loads(out)
+        imports.append(sample["import"])
+        renders.append(sample["render"])
+        rss.append(sample["maxrss_kb"])
+    return {
+        "cold_process_ms": _metric(median(walls) * 1000, "ms"),
+        "cold_import_ms": _metric(median(imports) * 1000, "ms"),
+        "cold_first_render_ms": _metric(median(renders) * 1000, "ms"),
+        "cold_maxrss_kb": _metric(median(rss), "KB"),
+    }
+
+
+def bench_batch(n_leads):
+    results = {}
+    worker_counts = sorted({1, 4, os.cpu_count() or 1})
+    with tempfile.TemporaryDirectory() as tmp:
+        leads_path = os.path.join(tmp, "leads.jsonl")
+        with open(leads_path, "w", encoding="utf-8") as f:
+            for i in range(n_leads):
+                f.write(json.dumps(dict(SAMPLE_LEAD, brand_name=f"Brand {i}")) + "\n")
+        for workers in worker_counts:
+            out_dir = os.path.join(tmp, f"out-{workers}")
+            start = time.perf_counter()
+            result = render_batch(leads_path, out_dir, workers=workers)
+            elapsed = time.perf_counter() - start
+            if result.failures:
+                raise RuntimeError(f"batch benchmark failed: {result.failures[:3]}")
+            results[f"batch_{workers}w_docs_per_s"] = _metric(result.rendered / elapsed, "docs/s", "higher")
+    return results
+
+
+def run_benchmarks(quick=False):
+    repeat = 3 if quick else 15
+    results = {}
+    results.update(bench_text(repeat))
+    results.update(bench_render(repeat * 2))
+    results.update(bench_cold(2 if quick else 5))
+    results.update(bench_batch(40 if quick else 400))
+    return results
+
+
+def compare(current, baseline, threshold):
+    """(name, baseline, current, change) for every metric worse than baseline by more than threshold."""
+    regressions = []
+    for name, base in baseline.items():
+        cur = current.get(name)
+        if cur is None or not base["value"]:
+            continue
+        change = (cur["value"] - base["value"]) / base["value"]
+        worse = change > threshold if base["better"] == "lower" else change < -threshold
+        if worse:
+            regressions.append((name, base["value"], cur["value"], change))
+    return regressions
+
+
+def print_table(results, baseline=None):
+    baseline = baseline or {}
+    for name, m in results.items():
+        line = f"  {name:<30} {m['value']:>12.2f} {m['unit']:<8}"
+        if name in baseline and baseline[name]["value"]:
+            line += f" ({(m['value'] - baseline[name]['value']) / baseline[name]['value']:+.1%} vs baseline)"
+        print(line)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the one-pager generator.")
+    parser.add_argument("--baseline", default="one-pager-bench.json", help="baseline JSON to compare against / save to")
+    parser.add_argument("--save", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed regression as a fraction (default 0.15)")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations and a smaller batch")
+    parser.add_argument("--json", action="store_true", help="print results as JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(quick=args.quick)
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["metrics"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results, baseline)
+
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "cpus": os.cpu_count(), "metrics": results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        for name, base, cur, change in regressions:
+            print(f"REGRESSION {name}: {base:.2f} -> {cur:.2f} ({change:+.1%})")
+        return 1 if regressions else 0
+    return 0
@@ -0,0 +1,152 @@
+"""
+Content-addressed render cache.
+
+A render is keyed by a hash of everything that can change its bytes: the lead,
+the spec (the page copy, see spec.py), the contents of the font and image files
+they name, any --optimize settings, the template (the UPPERCASE theme and
+layout constants in theme.py and layout.py) and layout.LAYOUT_VERSION, which is
+bumped whenever layout or drawing code changes output for the same input. PDFs live on disk under their
+key and the least recently used ones are evicted once the directory passes
+max_bytes.
+"""
+
+from functools import lru_cache
+import hashlib
+import json
+import os
+import tempfile
+
+from . import fonts, images, layout, theme
+from .render import create_one_pager, write_pdf
+from .spec import default_spec
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def template_fingerprint():
+    """Hash of the module-level constants the layout reads."""
+    h = hashlib.sha256()
+    for module in (theme, layout):
+        for name in sorted(vars(module)):
+            if name.isupper():
+                h.update(f"{module.__name__}.{name}={getattr(module, name)!r}\n".encode())
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=32)
+def spec_fingerprint(spec):
+    """Hash of a spec.Spec's content, including the contents of its font and image files."""
+    files = fonts.fingerprint(spec.fonts) + images.fingerprint((spec.header.logo, spec.hero.image))
+    payload = json.dumps([spec, files], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_key(lead, spec=None, optimize=None):
+    """Stable cache key for rendering lead with spec and optimize, the current template and layout version."""
+    lead = lead or {}
+    content = {
+        "layout": layout.LAYOUT_VERSION,
+        "template": template_fingerprint(),
+        "spec": spec_fingerprint(spec or default_spec()),
+        "lead": lead,
+    }
+    if lead.get("screenshot"):
+        content["screenshot"] = images.IMAGES.digest(lead["screenshot"])
+    if optimize is not None:
+        content["optimize"] = optimize._asdict()
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class RenderCache:
+    """
+    Directory of rendered PDFs named by render_key(), with size-based LRU eviction.
+
+    Recency is the file mtime, refreshed on every hit, so several processes can
+    share one directory. The running size is an estimate per process; eviction
+    rescans the directory, so it self-corrects. suffix names the files, e.g.
+    ".png" for a cache of previews (see preview.py).
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, suffix=".pdf"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def _entries(self):
+        """(mtime, path, size) for every cached file."""
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(self.suffix):
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue  # evicted by another process
+                    yield st.st_mtime, entry.path, st.st_size
+
+    def get(self, key):
+        """Cached bytes for key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store data under key, atomically, then evict if over budget."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used files until the cache is back under 90% of max_bytes."""
+        entries = sorted(self._entries())
+        self._size = sum(size for _, _, size in entries)
+        target = self.max_bytes * 0.9
+        for _, path, size in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "bytes": self._size}
+
+
+def cached_one_pager(cache, output=None, lead=None, probe=None, spec=None, optimize=None):
+    """create_one_pager() through cache; returns (pdf_bytes, hit)."""
+    key = render_key(lead, spec, optimize)
+    data = cache.get(key)
+    hit = data is not None
+    if not hit:
+        data = create_one_pager(None, lead, probe, spec, optimize=optimize)
+        cache.put(key, data)
+    if output is not None:
+        write_pdf(data, output)
+    return data, hit
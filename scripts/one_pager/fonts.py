@@ -0,0 +1,207 @@
+"""
+TrueType font registry: brand typefaces, parsed once and shared between processes.
+
+reportlab's TTFont parses the font file in pure Python (table directory, cmap,
+hmtx, glyph offsets) every time one is constructed, i.e. in every process that
+renders with it. FontRegistry parses a file once per content hash and keeps the
+result in a cache directory:
+
+    <digest>-<tag>.ttf          copy of the font, memory-mapped when a face is loaded
+    <digest>-<tag>.face         the parsed face, pickled without the font bytes
+    <digest>-<tag>.widths.json  advance widths, so layout can measure without reportlab
+
+The pickle is reportlab's private TTFontFace state, so tag (see cache_tag())
+names the reportlab version and this cache's format: after an upgrade fonts
+are parsed afresh rather than unpickled into a face the new code does not
+expect.
+
+Registering a font that is already cached costs a hash of the file and a JSON
+load; rendering with it adds an unpickle and an mmap whose pages every process
+using the font shares. Fonts loaded before a worker pool starts are inherited
+by forked workers outright (see preload()).
+
+A spec's typeface (spec.fonts) is registered as "<file stem>-<digest prefix>",
+so the same file gets the same font name in every process.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import shutil
+import tempfile
+
+Typeface = namedtuple("Typeface", "regular bold italic")  # font names
+HELVETICA = Typeface("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+
+FONT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "one-pager", "fonts")
+
+FONT_CACHE_FORMAT = 1  # bump when what _parse() writes changes
+
+_Font = namedtuple("_Font", "path digest")
+
+
+@lru_cache(maxsize=None)
+def cache_tag():
+    """Suffix for cache entries: this cache's format and the reportlab version whose internals are pickled."""
+    import reportlab  # the package alone, not the PDF machinery
+
+    return f"v{FONT_CACHE_FORMAT}-rl{reportlab.Version}"
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _pdf_scale(units_per_em):
+    """The glyph-unit to 1/1000 em converter TTFontFile sets up (a lambda, so not pickled)."""
+    if units_per_em == 1000:
+        return lambda x: x
+    factor = 1000 / units_per_em
+    return lambda x: x * factor
+
+
+def _write_atomic(path, write):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class FontRegistry:
+    """TrueType fonts by name, backed by an on-disk cache of parsed faces shared by every process."""
+
+    def __init__(self, cache_dir=FONT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.parsed = 0  # fonts this process had to parse
+        self._fonts = {}  # name -> _Font
+        self._names = {}  # (path, size, mtime_ns) -> name
+        self._widths = {}  # name -> ({char: width}, default width)
+        self._loaded = set()  # names registered with reportlab in this process
+
+    def _cached(self, digest, ext):
+        return os.path.join(self.cache_dir, f"{digest}-{cache_tag()}{ext}")
+
+    def register(self, path):
+        """Make the TrueType font at path available to layout and return its font name."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)
+        name = self._names.get(key)
+        if name is not None:
+            return name
+        digest = _file_digest(path)
+        name = f"{os.path.splitext(os.path.basename(path))[0]}-{digest[:10]}"
+        if not os.path.exists(self._cached(digest, ".widths.json")):
+            self._parse(path, digest)
+        with open(self._cached(digest, ".widths.json"), encoding="utf-8") as f:
+            table = json.load(f)
+        self._widths[name] = ({chr(int(code)): w for code, w in table["widths"].items()}, table["default"])
+        self._fonts[name] = _Font(path, digest)
+        self._names[key] = name
+        return name
+
+    def _parse(self, path, digest):
+        """Parse path with reportlab and persist the face, a copy of the font and its widths."""
+        from reportlab.pdfbase.ttfonts import TTFontFace
+
+        face = TTFontFace(path)
+        state = {k: v for k, v in vars(face).items() if k not in ("_ttf_data", "_pdfScale")}
+        widths = {"default": face.defaultWidth, "widths": {str(code): w for code, w in face.charWidths.items()}}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # The widths file goes last: its presence marks a complete entry.
+        with open(path, "rb") as src:
+            _write_atomic(self._cached(digest, ".ttf"), lambda f: shutil.copyfileobj(src, f))
+        _write_atomic(self._cached(digest, ".face"), lambda f: pickle.dump(state, f, pickle.HIGHEST_PROTOCOL))
+        _write_atomic(self._cached(digest, ".widths.json"), lambda f: f.write(json.dumps(widths).encode()))
+        self.parsed += 1
+
+    def widths(self, name):
+        """({char: width in 1/1000 em}, default width) for a registered font, or None."""
+        return self._widths.get(name)
+
+    def digest(self, name):
+        return self._fonts[name].digest
+
+    def path(self, name):
+        """The cached copy of a registered font's file, e.g. for other renderers; None if unknown."""
+        font = self._fonts.get(name)
+        return None if font is None else self._cached(font.digest, ".ttf")
+
+    def load(self, name):
+        """Register font name with reportlab from the cache, without parsing it; no-op once done."""
+        if name in self._loaded or name not in self._fonts:
+            return
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFontFace
+
+        digest = self._fonts[name].digest
+        with open(self._cached(digest, ".face"), "rb") as f:
+            state = pickle.load(f)
+        with open(self._cached(digest, ".ttf"), "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        face = TTFontFace.__new__(TTFontFace)
+        face.__dict__.update(state)
+        face._ttf_data = data
+        face._pdfScale = _pdf_scale(face.unitsPerEm)
+        pdfmetrics.registerFont(_cached_ttfont(name, face))
+        self._loaded.add(name)
+
+
+def _cached_ttfont(name, face):
+    """A reportlab TTFont around an already parsed face; TTFont() itself would parse the file again."""
+    from fnmatch import fnmatch
+    from weakref import WeakKeyDictionary
+
+    from reportlab import rl_config
+    from reportlab.pdfbase.ttfonts import TTEncoding, TTFont, unShapedFontGlob
+
+    font = TTFont.__new__(TTFont)
+    font.fontName = name
+    font.face = face
+    font.encoding = TTEncoding()
+    font.state = WeakKeyDictionary()
+    font._asciiReadable = rl_config.ttfAsciiReadable
+    font.shapable = not any(fnmatch(name, glob) for glob in unShapedFontGlob)
+    return font
+
+
+REGISTRY = FontRegistry()
+
+
+@lru_cache(maxsize=32)
+def typeface(fonts):
+    """Typeface for a spec.Fonts (font file paths), registering the files; HELVETICA for None."""
+    if fonts is None:
+        return HELVETICA
+    return Typeface(*(REGISTRY.register(path) for path in fonts))
+
+
+def load_typeface(face):
+    """Make every TrueType font of a Typeface drawable in this process (built-in faces need nothing)."""
+    for name in face:
+        REGISTRY.load(name)
+
+
+def preload(spec):
+    """Register and load a spec's fonts now, e.g. in a parent process before it forks workers."""
+    if spec is not None and spec.fonts is not None:
+        load_typeface(typeface(spec.fonts))
+
+
+def fingerprint(fonts):
+    """Content digests of a spec.Fonts' files, for cache keys; () for the built-in faces."""
+    if fonts is None:
+        return ()
+    return tuple(REGISTRY.digest(name) for name in typeface(fonts))
@@ -0,0 +1,136 @@
+"""
+Section-level render cache: compiled content-stream fragments reused across documents.
+
+Drawing a block appends operators to the canvas's content stream, registers
+the fonts and alpha graphics states it uses, and leaves the graphics state
+tracked by StateCanvas changed. A FragmentCache records all three the first
+time a block is drawn and replays them the next time the same block is drawn
+at the same offset from the same starting state, without running any drawing
+code.
+
+The key is the Block itself (every positioned item, so the section's inputs
+and its bounding box), its offset, and the state drawing starts from: tracked
+font, colors, line width and dash, the canvas font, current alpha values, and
+the names already given to fonts and graphics states in the document, and the
+glyph codes each TrueType font has assigned so far (its subsets grow as text is
+drawn, see fonts.py). Equal keys therefore produce byte-identical operators. When one field of a lead
+changes (a headline variant, say), only the blocks it touches are drawn again.
+"""
+
+from collections import OrderedDict, namedtuple
+import copy
+
+FRAGMENT_CACHE_SIZE = 256  # blocks per process; the stock page has nine
+
+# code: operators appended; fonts: fonts first used, in order; ext_gstates: ((key, value), name)
+# pairs first used, in order; exit: (tracked state, canvas font, current ExtGState values) afterwards;
+# subsets: ((TTFont, its per-document state), ...) afterwards
+Fragment = namedtuple("Fragment", "code fonts ext_gstates exit subsets")
+
+
+def _raw(c):
+    """The reportlab canvas under any StateCanvas/CountingCanvas proxies."""
+    while "_canvas" in vars(c):
+        c = vars(c)["_canvas"]
+    return c
+
+
+def _copy_state(state):
+    """Copy of a TTFont.State that drawing more text cannot change."""
+    state = copy.copy(state)
+    state.assignments = dict(state.assignments)
+    state.subsets = [list(subset) for subset in state.subsets]
+    return state
+
+
+def _subsets(doc):
+    """Each TrueType font the document uses, with a copy of its subset state."""
+    return tuple((font, _copy_state(font.state[doc])) for font in doc.delayedFonts)
+
+
+def _entry(c, raw):
+    ext, doc = raw._extgstate, raw._doc
+    return (c.snapshot(), raw._fontname, raw._fontsize, raw._leading, tuple(ext._d.items()), tuple(ext._c.items()),
+            tuple(doc.fontMapping.items()),
+            tuple((font.fontName, tuple(font.state[doc].assignments.items())) for font in doc.delayedFonts))
+
+
+def _exit(c, raw):
+    return c.snapshot(), (raw._fontname, raw._fontsize, raw._leading), tuple(raw._extgstate._d.items())
+
+
+class FragmentCache:
+    """LRU of Fragments keyed by (block, offset, starting state), shared by every document in a process."""
+
+    def __init__(self, max_entries=FRAGMENT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def draw(self, c, block, top, draw, *args):
+        """
+        Emit block at top on StateCanvas c; returns True if it was replayed from the cache.
+
+        On a miss, draw(c, block, top, *args) does the drawing and the result
+        is recorded. Blocks that use resources other than fonts and alpha
+        states (images, nested forms, spot colors) are drawn but not recorded.
+        """
+        raw = _raw(c)
+        key = (block, top, _entry(c, raw))
+        fragment = self._entries.get(key)
+        if fragment is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._replay(c, raw, fragment)
+            return True
+
+        self.misses += 1
+        code, ext = raw._code, raw._extgstate
+        mark, n_fonts, n_states = len(code), len(raw._doc.fontMapping), len(ext._c)
+        other = (len(raw._formsinuse), len(raw._colorsUsed))
+        draw(c, block, top, *args)
+        if (len(raw._formsinuse), len(raw._colorsUsed)) != other:
+            return False
+        self._entries[key] = Fragment(
+            tuple(code[mark:]),
+            tuple(raw._doc.fontMapping)[n_fonts:],
+            tuple(raw._extgstate._c.items())[n_states:],
+            _exit(c, raw),
+            _subsets(raw._doc),
+        )
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return False
+
+    @staticmethod
+    def _replay(c, raw, fragment):
+        doc = raw._doc
+        raw._code.extend(fragment.code)
+        subsets = dict(fragment.subsets)
+        dynamic = {font.fontName: font for font in subsets}
+        for name in fragment.fonts:  # registered under the same /Fn names as when recorded
+            font = dynamic.get(name)
+            if font is None:
+                doc.getInternalFontName(name)
+            else:  # what TTFont.getSubsetInternalName does on first use
+                doc.fontMapping[name] = "/" + subsets[font].internalName
+                doc.delayedFonts.append(font)
+        for font, state in subsets.items():
+            font.state[doc] = _copy_state(state)
+        if fragment.ext_gstates:
+            doc.ensureMinPdfVersion("transparency")  # what setFillAlpha()/setStrokeAlpha() would have done
+        raw._extgstate._c.update(fragment.ext_gstates)
+        state, (raw._fontname, raw._fontsize, raw._leading), ext_values = fragment.exit
+        raw._extgstate._d = dict(ext_values)
+        c.resume(state)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+FRAGMENTS = FragmentCache()  # default for create_one_pager() and create_combined()
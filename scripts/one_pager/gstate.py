@@ -0,0 +1,110 @@
+"""
+Graphics-state tracking canvas wrapper.
+
+reportlab writes every setFont/setFillColor/... call to the content stream,
+even when the state is already what is asked for. The drawing code sets font
+and colors before each item, so most of those operators are no-ops:
+StateCanvas remembers the current font, fill and stroke color, line width and
+dash, and only passes calls through that change something.
+
+The tracked state follows the PDF rules: saveState/restoreState push and pop
+it, and a form's content starts from an unknown state since it inherits
+whatever is current where the form is drawn. Alpha needs no tracking here;
+reportlab's ExtGState already skips unchanged values.
+"""
+
+from reportlab.lib.colors import Color
+
+_UNKNOWN = object()
+_STATE = ("font", "fill", "stroke", "line_width", "dash")
+
+
+def color_key(color):
+    if isinstance(color, Color):
+        return (color.red, color.green, color.blue, color.alpha)
+    return color if not isinstance(color, list) else tuple(color)
+
+
+class StateCanvas:
+    """Canvas proxy that drops graphics-state changes which would not change anything."""
+
+    def __init__(self, canvas):
+        self._canvas = canvas
+        self._stack = []
+        self.elided = 0  # state-setting calls dropped
+        self._reset()
+
+    def __getattr__(self, name):
+        attr = getattr(self._canvas, name)
+        if callable(attr):
+            setattr(self, name, attr)  # bound methods never change; skip __getattr__ next time
+        return attr
+
+    def _reset(self):
+        self._state = dict.fromkeys(_STATE, _UNKNOWN)
+
+    def tracked(self, field):
+        """Current value of a tracked field, or None when unknown."""
+        value = self._state[field]
+        return None if value is _UNKNOWN else value
+
+    def assume(self, field, key):
+        """Record a state change made behind the wrapper's back, e.g. inside a text object."""
+        self._state[field] = key
+
+    def snapshot(self):
+        """Hashable copy of the whole tracked state, for resume() or as a cache key."""
+        return tuple(self._state.values())
+
+    def resume(self, snapshot):
+        """Adopt a snapshot(), e.g. after replaying recorded operators that left the canvas in that state."""
+        self._state = dict(zip(_STATE, snapshot))
+
+    def _changed(self, field, key):
+        if self._state[field] == key:
+            self.elided += 1
+            return False
+        self._state[field] = key
+        return True
+
+    def setFont(self, name, size, leading=None):
+        if self._changed("font", (name, size, size * 1.2 if leading is None else leading)):
+            self._canvas.setFont(name, size, leading)
+
+    def setFillColor(self, color, alpha=None):
+        if self._changed("fill", (color_key(color), alpha)):
+            self._canvas.setFillColor(color, alpha)
+
+    def setStrokeColor(self, color, alpha=None):
+        if self._changed("stroke", (color_key(color), alpha)):
+            self._canvas.setStrokeColor(color, alpha)
+
+    def setLineWidth(self, width):
+        if self._changed("line_width", width):
+            self._canvas.setLineWidth(width)
+
+    def setDash(self, array=(), phase=0):
+        key = ((array, phase), 0) if isinstance(array, (int, float)) else (tuple(array), phase)
+        if self._changed("dash", key):
+            self._canvas.setDash(array, phase)
+
+    def saveState(self):
+        self._stack.append(self._state.copy())
+        self._canvas.saveState()
+
+    def restoreState(self):
+        self._state = self._stack.pop()
+        self._canvas.restoreState()
+
+    def beginForm(self, *args, **kwargs):
+        self._stack.append(self._state)
+        self._reset()
+        self._canvas.beginForm(*args, **kwargs)
+
+    def endForm(self, **kwargs):
+        self._state = self._stack.pop()
+        self._canvas.endForm(**kwargs)
+
+    def showPage(self):
+        self._reset()
+        self._canvas.showPage()
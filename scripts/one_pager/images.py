@@ -0,0 +1,125 @@
+"""
+Raster assets: decoded, downsampled and re-encoded once, then cached on disk.
+
+Layout places an Image item in a box measured in points. Before it is drawn,
+ImageCache.prepare() turns the source file into one sized for that box at
+IMAGE_DPI. The source is decoded with Pillow, then cropped ("cover") or scaled
+to fit ("contain") the box, and never upsampled. It is re-encoded as JPEG when
+opaque, which reportlab embeds as is, or as PNG when there is transparency to
+keep. Results are stored under the source's content hash and target size, so
+each variant is made once per machine, and remembered per process, so repeated
+renders do not even re-hash the source.
+
+reportlab embeds a file drawn with drawImage() once per document however many
+pages place it, so in a combined PDF each asset is a single shared image
+XObject.
+"""
+
+import hashlib
+import io
+from math import ceil
+import os
+import tempfile
+
+IMAGE_DPI = 150  # resolution images are resampled to at their placed size
+JPEG_QUALITY = 85
+IMAGE_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "one-pager", "images")
+FITS = ("cover", "contain")
+
+
+def _has_alpha(im):
+    """Whether im has any pixel that is not fully opaque."""
+    if im.mode not in ("RGBA", "LA"):
+        return False
+    return im.getchannel("A").getextrema()[0] < 255
+
+
+def _target_size(size, box, fit):
+    """Pixel size for a source of size in a box of pixels: cropped to its aspect or fitted inside, not upsampled."""
+    (sw, sh), (bw, bh) = size, box
+    if fit == "cover":
+        crop_w = min(sw, sh * bw / bh)  # the widest crop with the box's aspect ratio
+        scale = min(1, crop_w / bw)
+        return max(1, round(bw * scale)), max(1, round(bh * scale))
+    scale = min(1, bw / sw, bh / sh)
+    return max(1, round(sw * scale)), max(1, round(sh * scale))
+
+
+class ImageCache:
+    """Source image -> resized, re-encoded file for a placed box, backed by a content-addressed directory."""
+
+    def __init__(self, cache_dir=IMAGE_CACHE_DIR, dpi=IMAGE_DPI):
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.encoded = 0  # variants this process had to make
+        self._digests = {}  # (path, size, mtime_ns) -> sha256 of the file
+        self._prepared = {}  # (digest, width, height, fit) -> prepared path
+
+    def digest(self, path):
+        """Content hash of the file at path, re-read only when its size or mtime changes."""
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(key)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 16), b""):
+                    h.update(block)
+            digest = self._digests[key] = h.hexdigest()
+        return digest
+
+    def prepare(self, path, width, height, fit="cover"):
+        """Path of path's image resampled for a width x height pt box, encoding it on first use."""
+        if fit not in FITS:
+            raise ValueError(f"Unknown image fit {fit!r}; expected one of {', '.join(FITS)}")
+        digest = self.digest(path)
+        key = (digest, width, height, fit)
+        prepared = self._prepared.get(key)
+        if prepared is None:
+            box = (max(1, ceil(width * self.dpi / 72)), max(1, ceil(height * self.dpi / 72)))
+            stem = os.path.join(self.cache_dir, f"{digest}-{fit}-{box[0]}x{box[1]}")
+            prepared = next((stem + ext for ext in (".jpg", ".png") if os.path.exists(stem + ext)), None)
+            if prepared is None:
+                prepared = self._encode(path, stem, box, fit)
+            self._prepared[key] = prepared
+        return prepared
+
+    def _encode(self, path, stem, box, fit):
+        from PIL import Image, ImageOps
+
+        with Image.open(path) as im:
+            im = ImageOps.exif_transpose(im)
+            im.load()
+        if im.mode not in ("L", "LA", "RGB", "RGBA"):
+            im = im.convert("RGBA")  # palette, bilevel, CMYK: resample in a mode LANCZOS supports
+        size = _target_size(im.size, box, fit)
+        if fit == "cover":
+            im = ImageOps.fit(im, size, Image.LANCZOS, centering=(0.5, 0.0))  # screenshots keep their top
+        elif size != im.size:
+            im = im.resize(size, Image.LANCZOS)
+        buf = io.BytesIO()
+        if _has_alpha(im):
+            ext = ".png"
+            im.save(buf, "PNG", optimize=True)
+        else:
+            ext = ".jpg"
+            im.convert("L" if im.mode in ("L", "LA") else "RGB").save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(buf.getvalue())
+            os.replace(tmp, stem + ext)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.encoded += 1
+        return stem + ext
+
+
+IMAGES = ImageCache()
+
+
+def fingerprint(paths):
+    """Content digests of the image files among paths (None entries skipped), for cache keys."""
+    return tuple(IMAGES.digest(path) for path in paths if path)
@@ -0,0 +1,162 @@
+"""
+Opt-in per-section instrumentation for layout and rendering.
+
+Pass a Probe as probe= to create_one_pager() (or layout_page()/render_page())
+and it accumulates, per section (Block name):
+
+    layout_ms / render_ms   wall time spent laying out and drawing the section
+    canvas_calls            calls made on the canvas while drawing it
+    width_calls             text width lookups (string_width, and each word wrap_text measures)
+    width_misses            lookups the width caches had to measure
+    stream_bytes            uncompressed content-stream bytes emitted
+    reused                  draws replayed from the fragment cache (see fragments.py)
+
+plus time per drawing item type (Text, RoundRect, Feather, ...) so slow helpers
+stand out. Width counts come from the text_units LRU statistics and the
+word counters of measure_words() (metrics.width_stats()), both kept anyway, so
+nothing is slowed down by an active probe.
+
+A probe can span many renders; report() hands the totals to the sink, which
+is any callable taking the report dict: table_sink(), json_sink() or your own.
+"""
+
+from contextlib import contextmanager
+import json
+import sys
+import time
+
+from .metrics import width_stats
+
+SECTION_FIELDS = ("layout_ms", "render_ms", "canvas_calls", "width_calls", "width_misses", "stream_bytes", "reused")
+
+
+class CountingCanvas:
+    """Canvas proxy that counts method calls into the owning probe's current section."""
+
+    def __init__(self, canvas, probe):
+        self._canvas = canvas
+        self._probe = probe
+
+    def __getattr__(self, name):
+        attr = getattr(self._canvas, name)
+        if not callable(attr):
+            return attr
+        probe = self._probe
+
+        def counted(*args, **kwargs):
+            probe.canvas_calls += 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+class Probe:
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.renders = 0
+        self.sections = {}
+        self.items = {}  # item type name -> [count, seconds]
+        self.canvas_calls = 0
+
+    def _section(self, name):
+        stats = self.sections.get(name)
+        if stats is None:
+            stats = self.sections[name] = dict.fromkeys(SECTION_FIELDS, 0)
+        return stats
+
+    def canvas(self, c):
+        return c if isinstance(c, CountingCanvas) else CountingCanvas(c, self)
+
+    @contextmanager
+    def layout(self, name):
+        """Time laying out section name and count the width lookups it makes."""
+        calls, misses = width_stats()
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        after_calls, after_misses = width_stats()
+        stats = self._section(name)
+        stats["layout_ms"] += elapsed * 1000
+        stats["width_calls"] += after_calls - calls
+        stats["width_misses"] += after_misses - misses
+
+    @contextmanager
+    def render(self, name, c):
+        """Time drawing section name on c, counting canvas calls and stream bytes."""
+        code = c._code
+        mark = len(code)
+        calls = self.canvas_calls
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        stats = self._section(name)
+        stats["render_ms"] += elapsed * 1000
+        stats["canvas_calls"] += self.canvas_calls - calls
+        stats["stream_bytes"] += sum(len(op) + 1 for op in code[mark:])
+
+    def reused(self, name):
+        """Count a draw of section name served from the fragment cache."""
+        self._section(name)["reused"] += 1
+
+    def item(self, kind, seconds):
+        entry = self.items.get(kind)
+        if entry is None:
+            entry = self.items[kind] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def merge(self, other):
+        """Fold another probe's totals (e.g. from a worker process) into this one."""
+        self.renders += other["renders"]
+        for name, stats in other["sections"].items():
+            mine = self._section(name)
+            for field in SECTION_FIELDS:
+                mine[field] += stats[field]
+        for kind, (count, seconds) in other["items"].items():
+            entry = self.items.setdefault(kind, [0, 0.0])
+            entry[0] += count
+            entry[1] += seconds
+
+    def snapshot(self):
+        return {"renders": self.renders, "sections": self.sections, "items": self.items}
+
+    def report(self):
+        """Send the accumulated snapshot to the sink and return it."""
+        snap = self.snapshot()
+        if self.sink:
+            self.sink(snap)
+        return snap
+
+
+def table_sink(target=None):
+    """Sink printing a per-section and per-item table to a path or text stream (default stdout)."""
+    def sink(report):
+        if target is None or hasattr(target, "write"):
+            _print_table(report, target or sys.stdout)
+        else:
+            with open(target, "w", encoding="utf-8") as f:
+                _print_table(report, f)
+    return sink
+
+
+def _print_table(report, out):
+    print(f"Per-section totals over {report['renders']} render(s):", file=out)
+    print(f"  {'section':<13}{'layout ms':>10}{'render ms':>10}{'canvas':>8}{'widths':>8}{'misses':>8}{'bytes':>9}"
+          f"{'reused':>8}", file=out)
+    for name, s in report["sections"].items():
+        print(f"  {name:<13}{s['layout_ms']:>10.2f}{s['render_ms']:>10.2f}{s['canvas_calls']:>8}"
+              f"{s['width_calls']:>8}{s['width_misses']:>8}{s['stream_bytes']:>9}{s['reused']:>8}", file=out)
+    print(f"  {'item':<13}{'count':>10}{'ms':>10}{'us/each':>10}", file=out)
+    for kind, (count, seconds) in sorted(report["items"].items(), key=lambda kv: -kv[1][1]):
+        print(f"  {kind:<13}{count:>10}{seconds * 1000:>10.2f}{seconds * 1e6 / max(count, 1):>10.1f}", file=out)
+
+
+def json_sink(target):
+    """Sink writing the report as JSON to a path or text stream."""
+    def sink(report):
+        if hasattr(target, "write"):
+            json.dump(report, target, indent=2)
+            target.write("\n")
+        else:
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    return sink
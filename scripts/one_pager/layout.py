@@ -0,0 +1,608 @@
+"""
+Layout pass for the one-pager.
+
+Each section is laid out into an immutable Block of drawing items whose y
+coordinates are relative to the block's top edge (so they are <= 0). The page
+stacks blocks top to bottom and records where each one lands; the renderer adds
+that offset when drawing. Sections that do not depend on the lead are laid out
+once per spec, shared by every page, and flagged static so the renderer can
+emit them as forms reused by every page of a multi-page document.
+
+The copy comes from a Spec (see spec.py); layout_page() uses the stock page
+unless given one. Like metrics.py, this module never imports reportlab, so
+validating a spec or dry-running a layout stays cheap. Text is set in the
+spec's Typeface (see fonts.py), the built-in Helvetica faces by default.
+
+Sections carrying variable-length copy take a Fit: a type scale and a
+line-pitch (leading) factor. When the stacked page would run past the bottom
+margin, layout_page() shrinks them one section at a time, in FIT_ORDER,
+binary-searching leading and then type scale against the section's measured
+height; nothing is rendered to find out. Every section measures how far its
+widest line runs past its column even after wrapping (a single long word, an
+over-long title or badge) as its Block's overhang; those in FIT_ORDER are
+shrunk the same way until they fit across too, and any other overhang is a
+FitError. The Page records what was shrunk.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from math import ceil
+
+from .fonts import HELVETICA, typeface
+from .metrics import string_width, wrap_text
+from .spec import default_spec
+from .theme import (
+    RGBA, hex_color, GREEN, GREEN_DARK, GREEN_BG, TEXT_DARK, TEXT_MUTED, TEXT_LIGHT, BG_PAGE, BORDER, WHITE, WARM_BG,
+    WIDTH, HEIGHT, MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM, CONTENT_WIDTH,
+)
+
+# Bump when a change to layout or drawing code changes the PDF for the same
+# content; it is part of every render cache key (see cache.py).
+LAYOUT_VERSION = 9
+
+# Distinct (spec section, fit) pairs whose static sections stay cached per process.
+SECTION_CACHE_SIZE = 32
+
+# ─── AUTO-FIT ───
+FIT_ORDER = ("columns", "problem", "retainer", "hero")  # sections shrunk first to last
+MIN_LEADING = 0.85  # floor on the line-pitch factor
+MIN_SCALE = 0.8  # floor on the type scale
+FIT_STEP = 0.01  # search granularity for both
+
+# ─── HERO IMAGE ───
+HERO_IMAGE_WIDTH = 150  # beside the headline when the spec or lead has one
+HERO_IMAGE_GAP = 14
+
+# ─── LAYOUT TREE ───
+Rect = namedtuple("Rect", "x y w h fill")
+RoundRect = namedtuple("RoundRect", "x y w h radius fill stroke stroke_width")
+Circle = namedtuple("Circle", "x y r fill")
+Line = namedtuple("Line", "x1 y1 x2 y2 color width dash")
+Text = namedtuple("Text", "x y text font size color align")
+Feather = namedtuple("Feather", "x y size")
+Image = namedtuple("Image", "x y w h path fit")  # raster file in a box; fit is "cover" or "contain" (images.py)
+
+# static: same for every lead; overhang: points its widest line runs past its column (0 when all fit)
+Block = namedtuple("Block", "name height items static overhang", defaults=(False, 0))
+# blocks: ((top_y, Block), ...); fits: ((section name, Fit), ...) for sections auto-fit shrank;
+# typeface: the fonts.Typeface the text items are set in
+Page = namedtuple("Page", "width height title author blocks fits typeface", defaults=((), HELVETICA))
+
+# scale multiplies type sizes and the spacing around them; leading additionally
+# multiplies the pitch between lines of text.
+Fit = namedtuple("Fit", "scale leading")
+FULL = Fit(1.0, 1.0)
+
+
+class FitError(ValueError):
+    """The page overflows the bottom margin, or a section its column, even with every section at its floor."""
+
+    def __init__(self, overflow, overhang=0, section=None):
+        floors = f"even at minimum type scale ({MIN_SCALE:.0%}) and leading ({MIN_LEADING:.0%})"
+        if overhang > 0 and section not in FIT_ORDER:
+            message = f"The {section} copy runs {overhang:.1f}pt past its column; this section is not auto-fit"
+        elif overhang > 0:
+            message = f"The {section} copy runs {overhang:.1f}pt past its column {floors}"
+        else:
+            message = f"Page overflows the bottom margin by {overflow:.1f}pt {floors}"
+        super().__init__(message)
+        self.overflow = overflow
+        self.overhang = overhang
+        self.section = section
+
+    def __reduce__(self):  # rebuild from the measurements when unpickled from a worker process
+        return FitError, (self.overflow, self.overhang, self.section)
+
+
+def text(x, y, s, font, size, color, align="left"):
+    return Text(x, y, s, font, size, color, align)
+
+
+def line(x1, y1, x2, y2, color, width, dash=None):
+    return Line(x1, y1, x2, y2, color, width, dash)
+
+
+def round_rect(x, y, w, h, radius, fill_color=None, stroke_color=None, stroke_width=0.5):
+    return RoundRect(x, y, w, h, radius, fill_color, stroke_color, stroke_width)
+
+
+def overhang(lines, max_width, font, size):
+    """Points the widest of lines runs past max_width (0 when every line fits)."""
+    return max([string_width(ln, font, size) - max_width for ln in lines] + [0])
+
+
+def wrapped(x, y, s, max_width, font, size, color, leading):
+    """Text items for a wrapped paragraph starting at y, plus the y after the last line."""
+    items = []
+    for ln in wrap_text(s, max_width, font, size):
+        items.append(text(x, y, ln, font, size, color))
+        y -= leading
+    return items, y
+
+
+def lead_badge_text(lead, default="Built for Shopify Brand Founders"):
+    """Badge line for the hero: personalized when the lead names a brand."""
+    brand = lead.get("brand_name")
+    if not brand:
+        return default
+    parts = [lead["founder"]] if lead.get("founder") else []
+    parts.append(brand)
+    if lead.get("store_url"):
+        parts.append(lead["store_url"])
+    return "Prepared for " + "  ·  ".join(parts)
+
+
+# ═══════════════════════════════════════
+# SECTIONS
+# ═══════════════════════════════════════
+
+@lru_cache(maxsize=None)
+def layout_background():
+    """Page fill and decorative circles; placed with its top at HEIGHT."""
+    items = (
+        Rect(0, -HEIGHT, WIDTH, HEIGHT, BG_PAGE),
+        # Subtle green gradient circles (decorative)
+        Circle(WIDTH - 80, -100, 180, RGBA(0.42, 0.56, 0.44, 0.03)),
+        Circle(60, 200 - HEIGHT, 140, RGBA(0.83, 0.90, 0.84, 0.08)),
+    )
+    return Block("background", 0, items, static=True)
+
+
+@lru_cache(maxsize=SECTION_CACHE_SIZE)
+def layout_header(header, face=HELVETICA):
+    header_h = 32
+    rx = WIDTH - MARGIN_RIGHT
+    items = (
+        # Logo + brand name
+        Image(MARGIN_LEFT, -24, 20, 20, header.logo, "contain") if header.logo else Feather(MARGIN_LEFT + 2, -22, 16),
+        text(MARGIN_LEFT + 24, -11, header.brand, face.bold, 13, TEXT_DARK),
+        text(MARGIN_LEFT + 24, -22, header.tagline, face.regular, 7, TEXT_MUTED),
+        # Contact info (right side)
+        text(rx, -8, header.contact_name, face.bold, 7.5, TEXT_DARK, "right"),
+    ) + tuple(
+        text(rx, -18 - 9 * i, ln, face.regular, 6.5, TEXT_MUTED, "right")
+        for i, ln in enumerate(header.contact_lines)
+    ) + (
+        # Divider
+        line(MARGIN_LEFT, -header_h, WIDTH - MARGIN_RIGHT, -header_h, BORDER, 0.5),
+    )
+    # The brand and tagline stop short of the widest contact line
+    contact_w = max([string_width(header.contact_name, face.bold, 7.5)]
+                    + [string_width(ln, face.regular, 6.5) for ln in header.contact_lines])
+    brand_w = CONTENT_WIDTH - 24 - 20 - contact_w
+    spill = max(overhang([header.brand], brand_w, face.bold, 13), overhang([header.tagline], brand_w, face.regular, 7))
+    return Block("header", header_h + 10, items, static=True, overhang=spill)
+
+
+def layout_hero(badge_text, headline, headline_accent, subtext, stats, image=None, face=HELVETICA, fit=FULL):
+    s, lh = fit.scale, fit.scale * fit.leading
+    items = []
+    text_w = CONTENT_WIDTH - (HERO_IMAGE_WIDTH + HERO_IMAGE_GAP if image else 0)
+
+    # Badge: one line in a pill, set smaller (down to MIN_SCALE) rather than wrapped when too long
+    badge_size = max(min(6, 6 * (text_w - 16) / max(string_width(badge_text, face.bold, 6), 1)), 6 * MIN_SCALE)
+    badge_w = string_width(badge_text, face.bold, badge_size) + 16
+    items.append(round_rect(MARGIN_LEFT, -12, badge_w, 14, 3, fill_color=GREEN_BG, stroke_color=GREEN, stroke_width=0.4))
+    items.append(text(MARGIN_LEFT + 8, -9, badge_text, face.bold, badge_size, GREEN_DARK))
+    y = -20
+
+    # Headline, then its accent, each wrapped to the copy's width
+    head_lines = wrap_text(headline, text_w, face.bold, 17 * s) or [headline]
+    accent_lines = wrap_text(headline_accent, text_w, face.bold, 17 * s) or [headline_accent]
+    for ln in head_lines:
+        items.append(text(MARGIN_LEFT, y, ln, face.bold, 17 * s, TEXT_DARK))
+        y -= 20 * lh
+    for i, ln in enumerate(accent_lines):
+        if i:
+            y -= 20 * lh
+        items.append(text(MARGIN_LEFT, y, ln, face.bold, 17 * s, GREEN))
+    y -= 14 * lh
+
+    # Subtext
+    sub_items, y = wrapped(MARGIN_LEFT, y, subtext, text_w, face.regular, 7.5 * s, TEXT_MUTED, 10 * lh)
+    items.extend(sub_items)
+    spill = max(badge_w - text_w, overhang(head_lines + accent_lines, text_w, face.bold, 17 * s),
+                overhang([item.text for item in sub_items], text_w, face.regular, 7.5 * s))
+
+    # Image (e.g. the lead's store screenshot) beside the copy, framed
+    if image:
+        ix = MARGIN_LEFT + CONTENT_WIDTH - HERO_IMAGE_WIDTH
+        items.append(Image(ix, y, HERO_IMAGE_WIDTH, -y, image, "cover"))
+        items.append(round_rect(ix, y, HERO_IMAGE_WIDTH, -y, 3, stroke_color=BORDER, stroke_width=0.5))
+    y -= 6 * s
+
+    # Stats row
+    stat_w = CONTENT_WIDTH / len(stats)
+    spill = max(spill, overhang([num for num, _ in stats], stat_w - 8, face.bold, 13 * s),
+                overhang([label for _, label in stats], stat_w - 8, face.regular, 5.5 * s))
+    stats_y = y
+    items.append(round_rect(MARGIN_LEFT, stats_y - 30 * s, CONTENT_WIDTH, 32 * s, 5, fill_color=WHITE, stroke_color=BORDER, stroke_width=0.4))
+    for i, (num, label) in enumerate(stats):
+        sx = MARGIN_LEFT + i * stat_w + stat_w / 2
+        items.append(text(sx, stats_y - 12 * s, num, face.bold, 13 * s, GREEN, "center"))
+        items.append(text(sx, stats_y - 22 * s, label, face.regular, 5.5 * s, TEXT_LIGHT, "center"))
+
+        # Vertical divider
+        if i < len(stats) - 1:
+            dx = MARGIN_LEFT + (i + 1) * stat_w
+            items.append(line(dx, stats_y - 5 * s, dx, stats_y - 27 * s, BORDER, 0.3))
+
+    return Block("hero", -(stats_y - 38 * s), tuple(items), overhang=spill)
+
+
+@lru_cache(maxsize=SECTION_CACHE_SIZE)
+def layout_problem(problem, face=HELVETICA, fit=FULL):
+    s, lh = fit.scale, fit.scale * fit.leading
+    size = 6.5 * s
+    pb_lines = wrap_text(problem.text, CONTENT_WIDTH - 20, face.regular, size)
+    pb_h = len(pb_lines) * 9 * lh + 10 * s
+
+    items = [round_rect(MARGIN_LEFT, -pb_h, CONTENT_WIDTH, pb_h, 4, fill_color=hex_color("#FFF8F0"), stroke_color=hex_color("#E8D5C0"), stroke_width=0.4)]
+
+    # Lead-in ("Sound familiar?") bold, rest normal
+    bold_part = problem.lead
+    bw = string_width(bold_part, face.bold, size)
+    py = -10 * s
+    for li, ln in enumerate(pb_lines):
+        if li == 0:
+            items.append(text(MARGIN_LEFT + 10, py, bold_part, face.bold, size, hex_color("#8B6914")))
+            items.append(text(MARGIN_LEFT + 10 + bw, py, ln[len(bold_part):], face.regular, size, hex_color("#7A5F2A")))
+        else:
+            items.append(text(MARGIN_LEFT + 10, py, ln, face.regular, size, hex_color("#7A5F2A")))
+        py -= 9 * lh
+
+    spill = overhang(pb_lines, CONTENT_WIDTH - 20, face.regular, size)
+    return Block("problem", pb_h + 8 * s, tuple(items), static=True, overhang=spill)
+
+
+def section_heading(x, y, title, underline_gap, font="Helvetica-Bold", scale=1.0):
+    """Green heading with a rule under it; returns items and the y below the rule."""
+    size = 8 * scale
+    items = [
+        text(x, y, title, font, size, GREEN),
+        line(x, y - 4 * scale, x + string_width(title, font, size), y - 4 * scale, GREEN, 0.5),
+    ]
+    return items, y - 4 * scale - underline_gap
+
+
+@lru_cache(maxsize=SECTION_CACHE_SIZE)
+def layout_columns(systems, steps, impacts, quote, face=HELVETICA, fit=FULL):
+    s, lh = fit.scale, fit.scale * fit.leading
+    col_gap = 14
+    left_w = CONTENT_WIDTH * 0.52
+    right_w = CONTENT_WIDTH - left_w - col_gap
+    left_x = MARGIN_LEFT
+    right_x = MARGIN_LEFT + left_w + col_gap
+
+    # ─── LEFT COLUMN: Four AI Systems ───
+    items, y = section_heading(left_x, 0, systems.title, 10 * s, face.bold, s)
+    spill = overhang([systems.title], left_w, face.bold, 8 * s)
+
+    for i, (title, desc, flow) in enumerate(systems.items):
+        # Card background; a flow too long for one line wraps rather than being cut off
+        card_lines = wrap_text(desc, left_w - 36, face.regular, 6 * s)
+        flow_lines = wrap_text(flow, left_w - 36, face.regular, 4.5 * s)
+        card_h = 12 * s + len(card_lines) * 8.5 * lh + 16 * s + (len(flow_lines) - 1) * 6 * lh
+        items.append(round_rect(left_x, y - card_h, left_w, card_h, 4, fill_color=WHITE, stroke_color=BORDER, stroke_width=0.3))
+        spill = max(spill, overhang([title], left_w - 36, face.bold, 7.5 * s),
+                    overhang(card_lines, left_w - 36, face.regular, 6 * s),
+                    overhang(flow_lines, left_w - 36, face.regular, 4.5 * s))
+
+        # Number badge
+        items.append(round_rect(left_x + 6, y - 15, 16, 12, 3, fill_color=GREEN))
+        items.append(text(left_x + 14, y - 12, f"{i + 1:02d}", face.bold, 6.5, WHITE, "center"))
+
+        # Title
+        items.append(text(left_x + 28, y - 13 * s, title, face.bold, 7.5 * s, TEXT_DARK))
+
+        # Description
+        dy = y - 24 * s
+        for ln in card_lines:
+            items.append(text(left_x + 28, dy, ln, face.regular, 6 * s, TEXT_MUTED))
+            dy -= 8.5 * lh
+
+        # Flow line
+        dy -= 1 * s
+        for ln in flow_lines:
+            items.append(text(left_x + 28, dy, ln, face.regular, 4.5 * s, GREEN))
+            dy -= 6 * lh
+
+        y -= card_h + 4 * s
+
+    left_bottom_y = y
+
+    # ─── RIGHT COLUMN ───
+    # Section: How It Works
+    heading, y = section_heading(right_x, 0, steps.title, 10 * s, face.bold, s)
+    items.extend(heading)
+    spill = max(spill, overhang([steps.title, impacts.title], right_w, face.bold, 8 * s))
+
+    for i, (title, desc) in enumerate(steps.items):
+        # Step number circle
+        items.append(Circle(right_x + 8, y - 5 * s, 7 * s, GREEN))
+        items.append(text(right_x + 8, y - 7.5 * s, str(i + 1), face.bold, 6 * s, WHITE, "center"))
+
+        # Connecting line
+        if i < len(steps.items) - 1:
+            items.append(line(right_x + 8, y - 12 * s, right_x + 8, y - 28 * lh, hex_color("#D0DDD2"), 0.5, dash=(1, 2)))
+
+        # Title + desc
+        items.append(text(right_x + 20, y - 4 * s, title, face.bold, 7 * s, TEXT_DARK))
+        desc_items, dy = wrapped(right_x + 20, y - 14 * s, desc, right_w - 24, face.regular, 5.5 * s, TEXT_MUTED, 7.5 * lh)
+        items.extend(desc_items)
+        spill = max(spill, overhang([title], right_w - 24, face.bold, 7 * s),
+                    overhang([item.text for item in desc_items], right_w - 24, face.regular, 5.5 * s))
+
+        y = dy - 6 * s
+
+    y -= 2 * s
+
+    # Section: Expected Impact
+    heading, y = section_heading(right_x, y, impacts.title, 8 * s, face.bold, s)
+    items.extend(heading)
+
+    imp_w = right_w / 2
+    imp_h = 32 * s
+    for i, (num, label) in enumerate(impacts.items):
+        row = i // 2
+        col = i % 2
+        ix = right_x + col * (imp_w + 4)
+        iy = y - row * (imp_h + 4 * s)
+
+        items.append(round_rect(ix, iy - imp_h, imp_w - 4, imp_h, 4, fill_color=GREEN_BG, stroke_color=hex_color("#D0DDD2"), stroke_width=0.3))
+        items.append(text(ix + (imp_w - 4) / 2, iy - 14 * s, num, face.bold, 14 * s, GREEN, "center"))
+        items.append(text(ix + (imp_w - 4) / 2, iy - 24 * s, label, face.regular, 5.5 * s, TEXT_MUTED, "center"))
+
+    spill = max(spill, overhang([num for num, _ in impacts.items], imp_w - 8, face.bold, 14 * s),
+                overhang([label for _, label in impacts.items], imp_w - 8, face.regular, 5.5 * s))
+    y -= ceil(len(impacts.items) / 2) * (imp_h + 4 * s) + 4 * s
+
+    # Quote; the panel grows with the number of quote lines
+    quote_y = y
+    quote_lines = wrap_text(quote.text, right_w - 18, face.italic, 6 * s)
+    quote_h = 12 * s + len(quote_lines) * 8 * lh
+    items.append(line(right_x, quote_y, right_x, quote_y - quote_h + 4 * s, GREEN, 2))
+    items.append(round_rect(right_x + 6, quote_y - quote_h, right_w - 8, quote_h, 3, fill_color=WARM_BG))
+    qy = quote_y - 8 * s
+    for ln in quote_lines:
+        items.append(text(right_x + 10, qy, ln, face.italic, 6 * s, hex_color("#555555")))
+        qy -= 8 * lh
+    items.append(text(right_x + 10, qy - 2 * s, quote.attribution, face.bold, 5 * s, TEXT_LIGHT))
+    spill = max(spill, overhang(quote_lines, right_w - 18, face.italic, 6 * s),
+                overhang([quote.attribution], right_w - 18, face.bold, 5 * s))
+
+    bottom_y = min(left_bottom_y, quote_y - quote_h - 8 * s)
+    return Block("columns", -bottom_y + 2, tuple(items), static=True, overhang=spill)
+
+
+@lru_cache(maxsize=SECTION_CACHE_SIZE)
+def layout_perfect_for(perfect_for, face=HELVETICA):
+    strip_h = 28  # fixed: spec.py allows at most two lines per item, at -10 and -19
+    items = [round_rect(MARGIN_LEFT, -strip_h, CONTENT_WIDTH, strip_h, 5, fill_color=GREEN, stroke_color=None)]
+
+    item_w = CONTENT_WIDTH / len(perfect_for)
+    spill = 0
+    for i, item in enumerate(perfect_for):
+        parts = item.split("\n")
+        ix = MARGIN_LEFT + i * item_w + item_w / 2
+        spill = max(spill, overhang(parts[:1], item_w - 8, face.bold, 6), overhang(parts[1:], item_w - 8, face.regular, 5.5))
+
+        items.append(text(ix, -10, parts[0], face.bold, 6, WHITE, "center"))
+        if len(parts) > 1:
+            items.append(text(ix, -19, parts[1], face.regular, 5.5, RGBA(1, 1, 1, 0.8), "center"))
+
+        # Divider
+        if i < len(perfect_for) - 1:
+            dx = MARGIN_LEFT + (i + 1) * item_w
+            items.append(line(dx, -5, dx, -strip_h + 5, RGBA(1, 1, 1, 0.25), 0.3))
+
+    return Block("perfect_for", strip_h + 6, tuple(items), static=True, overhang=spill)
+
+
+@lru_cache(maxsize=SECTION_CACHE_SIZE)
+def layout_retainer(retainer, face=HELVETICA, fit=FULL):
+    s, lh = fit.scale, fit.scale * fit.leading
+    size = 5.5 * s
+    # The panel grows with the longer bullet column
+    rows = max(len(retainer.left), len(retainer.right), 1)
+    retainer_h = 22 * s + (rows - 1) * 9 * lh + 12 * s
+    items = [
+        round_rect(MARGIN_LEFT, -retainer_h, CONTENT_WIDTH, retainer_h, 5, fill_color=WHITE, stroke_color=BORDER, stroke_width=0.4),
+        text(MARGIN_LEFT + 10, -10 * s, retainer.title, face.bold, 7.5 * s, TEXT_DARK),
+    ]
+
+    spill = overhang([retainer.title], CONTENT_WIDTH - 20, face.bold, 7.5 * s)
+
+    # A left bullet stops 10pt short of the right column, a right one 10pt inside the panel
+    mid_x = MARGIN_LEFT + CONTENT_WIDTH / 2 + 10
+    for bullet_x, column, right in ((MARGIN_LEFT + 14, retainer.left, mid_x - 10),
+                                    (mid_x, retainer.right, MARGIN_LEFT + CONTENT_WIDTH - 10)):
+        ry = -22 * s
+        for bold_part, rest in column:
+            items.append(text(bullet_x, ry, "✦", face.bold, size, GREEN))
+            items.append(text(bullet_x + 10, ry, bold_part, face.bold, size, TEXT_DARK))
+            bw = string_width(bold_part, face.bold, size)
+            items.append(text(bullet_x + 10 + bw + 2, ry, rest, face.regular, size, TEXT_MUTED))
+            spill = max(spill, overhang([rest], right - (bullet_x + 10 + bw + 2), face.regular, size))
+            ry -= 9 * lh
+
+    return Block("retainer", retainer_h + 5 * s, tuple(items), static=True, overhang=spill)
+
+
+@lru_cache(maxsize=SECTION_CACHE_SIZE)
+def layout_credibility(creds, face=HELVETICA):
+    cred_h = 14
+    items = [round_rect(MARGIN_LEFT, -cred_h, CONTENT_WIDTH, cred_h, 3, fill_color=hex_color("#F5F5F3"))]
+
+    # Calculate total width for centering
+    total_w = sum(string_width(cr, face.bold, 5.5) for cr in creds) + 30 * (len(creds) - 1)
+    cx = MARGIN_LEFT + (CONTENT_WIDTH - total_w) / 2
+    spill = max(total_w - (CONTENT_WIDTH - 20), 0)
+    for i, cr in enumerate(creds):
+        items.append(text(cx, -cred_h + 4, cr, face.bold, 5.5, TEXT_DARK))
+        cx += string_width(cr, face.bold, 5.5)
+
+        if i < len(creds) - 1:
+            cx += 10
+            items.append(Circle(cx + 2, -cred_h + 6.5, 1.5, GREEN))
+            cx += 16
+
+    return Block("credibility", cred_h + 5, tuple(items), static=True, overhang=spill)
+
+
+@lru_cache(maxsize=SECTION_CACHE_SIZE)
+def layout_cta(cta, face=HELVETICA):
+    # The subtext wraps short of the contacts on the right and the bar grows to fit
+    contact_ws = [max(string_width(val, face.bold, 6), string_width(lbl, face.regular, 5)) for val, lbl in cta.contacts]
+    text_w = CONTENT_WIDTH - 24 - sum(w + 20 for w in contact_ws)
+    sub_lines = wrap_text(cta.subtext, text_w, face.regular, 6.5)
+    cta_h = 24 + 9 * (len(sub_lines) - 1) + 10
+    items = [
+        round_rect(MARGIN_LEFT, -cta_h, CONTENT_WIDTH, cta_h, 5, fill_color=GREEN),
+        # Left text
+        text(MARGIN_LEFT + 12, -13, cta.headline, face.bold, 9, WHITE),
+    ]
+    items.extend(text(MARGIN_LEFT + 12, -24 - 9 * i, ln, face.regular, 6.5, RGBA(1, 1, 1, 0.85))
+                 for i, ln in enumerate(sub_lines))
+
+    # Right contact info
+    crx = WIDTH - MARGIN_RIGHT - 12
+    for i, ((val, lbl), w) in enumerate(zip(reversed(cta.contacts), reversed(contact_ws))):
+        items.append(text(crx, -11, val, face.bold, 6, WHITE, "right"))
+        items.append(text(crx, -20, lbl, face.regular, 5, RGBA(1, 1, 1, 0.65), "right"))
+
+        crx -= w + 20
+
+        # Divider
+        if i < len(cta.contacts) - 1:
+            items.append(line(crx + 10, -6, crx + 10, -cta_h + 6, RGBA(1, 1, 1, 0.25), 0.3))
+
+    spill = max(overhang([cta.headline], text_w, face.bold, 9), overhang(sub_lines, text_w, face.regular, 6.5))
+    return Block("cta", cta_h, tuple(items), static=True, overhang=spill)
+
+
+# ═══════════════════════════════════════
+# PAGE
+# ═══════════════════════════════════════
+
+def _laid_out(probe, name, fn, *args):
+    if probe is None:
+        return fn(*args)
+    with probe.layout(name):
+        return fn(*args)
+
+
+def _fit_at(fit, field, floor, k):
+    """fit with field set k FIT_STEPs above floor."""
+    return fit._replace(**{field: round(floor + k * FIT_STEP, 4)})
+
+
+def _shrink(probe, name, fn, args, budget, fields=(("leading", MIN_LEADING), ("scale", MIN_SCALE))):
+    """
+    (Fit, Block) for the largest fit of a section whose height is at most budget.
+
+    Leading is searched first, keeping the type size, then type scale with
+    leading at its floor; fields, (name, floor) pairs, can limit the search. Each is a binary search over FIT_STEP increments,
+    which relies on a section never getting taller or wider as either factor
+    shrinks. A fit must also leave no overhang. When even the floors do not
+    fit, returns the floors.
+    """
+    def fits(block):
+        return block.height <= budget and block.overhang <= 0
+
+    fit = FULL
+    for field, floor in fields:
+        lo, hi = 0, round((1 - floor) / FIT_STEP)  # lo is tried next; hi, the current value, does not fit
+        fit = _fit_at(fit, field, floor, lo)
+        block = _laid_out(probe, name, fn, *args, fit)
+        if not fits(block):
+            continue
+        best = fit, block
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            trial = _fit_at(fit, field, floor, mid)
+            block = _laid_out(probe, name, fn, *args, trial)
+            if fits(block):
+                lo, best = mid, (trial, block)
+            else:
+                hi = mid
+        return best
+    return fit, block
+
+
+def layout_page(lead=None, probe=None, spec=None, fit=True):
+    """
+    Lay out the full page for an optional lead dict; only the hero depends on the lead.
+
+    spec is a spec.Spec with the page copy (default: the stock page). probe is
+    an optional instrument.Probe that records per-section layout cost.
+
+    A section in FIT_ORDER with an overhang is shrunk until its copy fits
+    across, and any other overhang raises FitError; then, if the sections would run past the bottom margin, they are
+    shrunk in FIT_ORDER until the page fits (see _shrink). page.fits lists
+    what was shrunk; FitError is raised when even the floors do not fit.
+    fit=False stacks the sections as they are, overflow and all.
+    """
+    lead = lead or {}
+    spec = spec or default_spec()
+    face = typeface(spec.fonts)
+    hero = spec.hero
+    hero_args = (
+        lead_badge_text(lead, hero.badge),
+        lead.get("headline") or hero.headline,
+        lead.get("headline_accent") or hero.headline_accent,
+        hero.subtext,
+        tuple(lead.get("stats") or hero.stats),
+        lead.get("screenshot") or hero.image,
+    )
+    flow = (
+        ("header", layout_header, (spec.header, face)),
+        ("hero", layout_hero, hero_args + (face,)),
+        ("problem", layout_problem, (spec.problem, face)),
+        ("columns", layout_columns, (spec.systems, spec.steps, spec.impacts, spec.quote, face)),
+        ("perfect_for", layout_perfect_for, (spec.perfect_for, face)),
+        ("retainer", layout_retainer, (spec.retainer, face)),
+        ("credibility", layout_credibility, (spec.credibility, face)),
+        ("cta", layout_cta, (spec.cta, face)),
+    )
+
+    laid = {name: _laid_out(probe, name, fn, *args) for name, fn, args in flow}
+    overflow = sum(block.height for block in laid.values()) - (HEIGHT - MARGIN_TOP - MARGIN_BOTTOM)
+    fits = {}
+    if fit:
+        sections = {name: (fn, args) for name, fn, args in flow}
+        for name, _, _ in flow:
+            if laid[name].overhang > 0 and name in FIT_ORDER:
+                before = laid[name].height
+                # Leading does not change widths, so only type scale is searched.
+                fits[name], laid[name] = _shrink(probe, name, *sections[name], before, (("scale", MIN_SCALE),))
+                overflow -= before - laid[name].height
+            if laid[name].overhang > 0:
+                raise FitError(overflow, laid[name].overhang, name)
+        if overflow > 0:
+            for name in FIT_ORDER:
+                before = laid[name].height
+                fits[name], laid[name] = _shrink(probe, name, *sections[name], before - overflow)
+                overflow -= before - laid[name].height
+                if overflow <= 0:
+                    break
+            else:
+                raise FitError(overflow)
+
+    blocks = [(HEIGHT, _laid_out(probe, "background", layout_background))]
+    y = HEIGHT - MARGIN_TOP
+    for name, _, _ in flow:
+        blocks.append((y, laid[name]))
+        y -= laid[name].height
+    return Page(WIDTH, HEIGHT, spec.title, spec.author, tuple(blocks), tuple(fits.items()), face)
+
+
+def describe_fits(page):
+    """One-line summary of what auto-fit shrank, e.g. "columns: type 100%, leading 87%"; "" if nothing."""
+    return "; ".join(f"{name}: type {fit.scale:.0%}, leading {fit.leading:.0%}" for name, fit in page.fits)
+
+
+def content_bottom(page):
+    """Lowest page y the stacked sections reach; below MARGIN_BOTTOM means the page overflows."""
+    top, block = page.blocks[-1]
+    return top - block.height
@@ -0,0 +1,85 @@
+"""
+Lead files: reading .jsonl/.csv rows and normalizing them into lead dicts.
+
+Kept apart from batch.py, and free of reportlab, so leads can be validated and
+laid out (--dry-run) without loading the renderer.
+"""
+
+import csv
+import json
+import os
+import re
+
+from .spec import IMAGE_EXTENSIONS, resolve_path
+
+LEAD_FIELDS = ("brand_name", "founder", "store_url", "headline", "headline_accent", "stats", "screenshot")
+
+
+def parse_stats(value):
+    """Stats come as [[num, label], ...] in JSONL or "num=label; num=label" in CSV."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        pairs = [item.split("=", 1) for item in value.split(";") if item.strip()]
+        if any(len(pair) != 2 for pair in pairs):
+            raise ValueError(f"Bad stats value {value!r}, expected 'num=label; num=label'")
+        return [(num.strip(), label.strip()) for num, label in pairs]
+    if not isinstance(value, (list, tuple)) or not all(
+            isinstance(pair, (list, tuple)) and len(pair) == 2
+            and all(isinstance(part, (str, int, float)) and not isinstance(part, bool) for part in pair)
+            for pair in value):
+        raise ValueError(f"Bad stats value {str(value)[:80]!r}, expected [[num, label], ...] of text or numbers")
+    return [(str(num), str(label)) for num, label in value]
+
+
+def normalize_lead(row):
+    """
+    Keep the known lead fields, dropping blanks so defaults apply.
+
+    Every field but stats (see parse_stats) must be a string; anything else
+    raises ValueError here rather than failing later in layout.
+    screenshot is an image of the lead's store, shown in the hero; a relative
+    path is resolved against the working directory.
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"expected a lead object, got {str(row)[:80]!r}")
+    lead = {k: row[k] for k in LEAD_FIELDS if row.get(k) not in (None, "")}
+    for field, value in lead.items():
+        if field != "stats" and not isinstance(value, str):
+            raise ValueError(f"{field} must be a string, got {type(value).__name__}")
+    if "stats" in lead:
+        lead["stats"] = parse_stats(lead["stats"])
+    if "screenshot" in lead:
+        errors = []
+        lead["screenshot"] = resolve_path(lead["screenshot"], os.getcwd(), "screenshot", "an image", IMAGE_EXTENSIONS,
+                                          errors)
+        if errors:
+            raise ValueError(errors[0])
+    return lead
+
+
+def read_leads(path):
+    """
+    Yield lead dicts from a .jsonl or .csv file.
+
+    A .jsonl line that is not valid JSON is yielded as the raw string, so it
+    fails in normalize_lead() like any other bad row instead of ending the run.
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield row
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        yield line.rstrip("\n")
+
+
+def lead_filename(index, lead):
+    """Stable, filesystem-safe PDF name for the lead at row index."""
+    slug = re.sub(r"[^a-z0-9]+", "-", lead.get("brand_name", "").lower()).strip("-")
+    return f"{index:05d}-{slug or 'lead'}.pdf"
@@ -0,0 +1,297 @@
+"""
+Linearized ("fast web view") PDFs: the first page's objects first, so a viewer
+can show it before the rest of the file has arrived.
+
+reportlab writes objects in creation order with a single cross-reference
+table at the end, so a viewer downloading the file has nothing to draw until
+the last byte is in. linearize() rewrites a finished file into the layout of
+PDF 1.7 Annex F:
+
+    header, linearization dictionary, first-page xref and trailer
+    catalog, primary hint stream
+    first page: its page object and everything only it (or it first) uses
+    remaining pages, each with the objects only it uses
+    objects shared by several later pages
+    everything else (page tree, document info), main xref and trailer
+
+Objects are renumbered to match (the first-page section takes the highest
+numbers, as the format requires); stream data is copied untouched. The hint
+stream carries the page offset and shared object hint tables for viewers that
+fetch later pages by byte range.
+
+Only what reportlab writes is handled: one classic cross-reference table, no
+object streams and no incremental updates.
+"""
+
+import re
+
+_XREF_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+# An indirect reference, or a string to skip (reportlab escapes parentheses inside strings).
+_REF = re.compile(rb"\((?:\\.|[^\\)])*\)|(\d+) 0 R\b")
+_PAGE_PARENT = re.compile(rb"/Parent \d+ 0 R")
+_FIELD = 10  # digits of every offset written before the objects are placed, so sizes do not move
+
+
+class _BitWriter:
+    """Big-endian bit packing for the hint tables; every item column starts on a byte boundary."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self._bits = 0
+        self._count = 0
+
+    def write(self, value, bits):
+        for shift in range(bits - 1, -1, -1):
+            self._bits = (self._bits << 1) | ((value >> shift) & 1)
+            self._count += 1
+            if self._count == 8:
+                self.data.append(self._bits)
+                self._bits = self._count = 0
+
+    def flush(self):
+        if self._count:
+            self.data.append(self._bits << (8 - self._count))
+            self._bits = self._count = 0
+
+    def column(self, values, bits):
+        for value in values:
+            self.write(value, bits)
+        self.flush()
+
+
+def _bits(n):
+    """Bits needed for numbers up to n."""
+    return n.bit_length()
+
+
+def _objects(data):
+    """(header bytes, {number: object bytes} in file order, trailer bytes) of a PDF with one classic xref table."""
+    start = int(data[data.rindex(b"startxref") + 9:].split()[0])
+    if not data.startswith(b"xref", start):
+        raise ValueError("linearize() needs a classic cross-reference table")
+    lines = data[start:data.index(b"trailer", start)].split(b"\n")
+    offsets = {}
+    number = None
+    for line in lines[1:]:
+        fields = line.split()
+        if len(fields) == 2:
+            number = int(fields[0])
+            continue
+        match = _XREF_ENTRY.match(line)
+        if match:
+            if match.group(3) == b"n":
+                offsets[number] = int(match.group(1))
+            number += 1
+    order = sorted(offsets, key=offsets.get)
+    ends = [offsets[n] for n in order[1:]] + [start]
+    objects = {n: data[offsets[n]:end] for n, end in zip(order, ends)}
+    return data[:offsets[order[0]]], objects, data[data.index(b"trailer", start):]
+
+
+def _split(obj):
+    """(dictionary part, stream part) of an object's bytes without its "n 0 obj" line; the stream part may be b""."""
+    body = obj[obj.index(b"obj") + 3:]
+    if b"endstream" not in body:
+        return body, b""
+    at = body.index(b"stream")  # reportlab writes no strings in stream dictionaries
+    return body[:at], body[at:]
+
+
+def _refs(text):
+    return [int(m.group(1)) for m in _REF.finditer(text) if m.group(1)]
+
+
+def _renumber(text, numbers):
+    return _REF.sub(lambda m: m.group(0) if m.group(1) is None else b"%d 0 R" % numbers[int(m.group(1))], text)
+
+
+def _trailer_ref(trailer, key):
+    match = re.search(rb"/" + key + rb" (\d+) 0 R", trailer)
+    return int(match.group(1)) if match else None
+
+
+def _pages(objects, node):
+    """Page object numbers under page tree node, in order."""
+    head = _split(objects[node])[0]
+    if b"/Type /Pages" not in head:
+        return [node]
+    kids = re.search(rb"/Kids \[([^\]]*)\]", head).group(1)
+    return [page for kid in _refs(kids) for page in _pages(objects, kid)]
+
+
+def _reachable(objects, heads, start, stop):
+    """Objects reachable from start through the dictionaries in heads, not entering or passing stop."""
+    seen, todo = [], [start]
+    while todo:
+        n = todo.pop()
+        if n in seen or n not in objects:
+            continue
+        seen.append(n)
+        todo.extend(ref for ref in reversed(_refs(heads[n])) if ref not in stop)
+    return seen
+
+
+def _hint_stream(pages, shared_first, shared_rest, first_page_offset, shared_offset, shared_first_number):
+    """
+    Hint stream data and the offset of its shared object table (/S).
+
+    pages is [(object count, byte length, [shared table indexes])] per page;
+    shared_first and shared_rest are the byte lengths of the one-object groups
+    of the first-page and shared sections. Laid out as qpdf does: content
+    stream hints cover the whole page, and the first page lists no shared
+    references since everything it uses is in its own section.
+    """
+    counts = [n for n, _, _ in pages]
+    lengths = [length for _, length, _ in pages]
+    shared = [refs for _, _, refs in pages]
+    least_count, least_length = min(counts), min(lengths)
+    count_bits = _bits(max(counts) - least_count)
+    length_bits = _bits(max(lengths) - least_length)
+    groups = shared_first + shared_rest
+    shared_count_bits = _bits(max(len(refs) for refs in shared))
+    shared_id_bits = _bits(max(len(groups) - 1, 0))
+
+    w = _BitWriter()
+    for value, bits in ((least_count, 32), (first_page_offset, 32), (count_bits, 16), (least_length, 32),
+                        (length_bits, 16), (0, 32), (0, 16), (least_length, 32), (length_bits, 16),
+                        (shared_count_bits, 16), (shared_id_bits, 16), (0, 16), (1, 16)):
+        w.write(value, bits)
+    w.column([n - least_count for n in counts], count_bits)
+    w.column([length - least_length for length in lengths], length_bits)
+    w.column([len(refs) for refs in shared], shared_count_bits)
+    w.column([ref for refs in shared for ref in refs], shared_id_bits)
+    w.column([], 0)  # numerators of the fractional positions: 0 bits each
+    w.column([], 0)  # content stream offsets: 0 bits each
+    w.column([length - least_length for length in lengths], length_bits)  # content stream lengths
+    shared_table = len(w.data)
+
+    least_group = min(groups) if groups else 0
+    group_bits = _bits(max(groups) - least_group) if groups else 0
+    for value, bits in ((shared_first_number, 32), (shared_offset, 32), (len(shared_first), 32), (len(groups), 32),
+                        (0, 16), (least_group, 32), (group_bits, 16)):
+        w.write(value, bits)
+    w.column([length - least_group for length in groups], group_bits)
+    w.column([0] * len(groups), 1)  # no MD5 signatures
+    w.column([], 0)  # objects per group, less one: 0 bits each
+    return bytes(w.data), shared_table
+
+
+def linearize(data):
+    """data, a PDF from reportlab, rewritten as a linearized PDF with the same objects and pages; idempotent."""
+    if b"/Linearized" in data[:1024]:
+        return data
+    header, objects, trailer = _objects(data)
+    root, info = _trailer_ref(trailer, b"Root"), _trailer_ref(trailer, b"Info")
+    heads = {n: _split(obj)[0] for n, obj in objects.items()}  # where the references are
+    pages_root = _refs(re.search(rb"/Pages \d+ 0 R", heads[root]).group(0))[0]
+    pages = _pages(objects, pages_root)
+    page_set = set(pages)
+    for page in pages:
+        heads[page] = _PAGE_PARENT.sub(b"", heads[page])  # walk down from pages, never back up the tree
+    stop = page_set | {root, pages_root}
+    uses = {page: _reachable(objects, heads, page, stop - {page}) for page in pages}
+    users = {}
+    for page in pages:
+        for n in uses[page]:
+            users.setdefault(n, []).append(page)
+
+    first = uses[pages[0]]
+    placed = set(first) | {root}
+    private = {}
+    for page in pages[1:]:
+        private[page] = [n for n in uses[page] if n not in placed and len(users[n]) == 1]
+        placed.update(private[page])
+    shared = [n for page in pages[1:] for n in uses[page] if n not in placed and len(users[n]) > 1]
+    shared = list(dict.fromkeys(shared))
+    placed.update(shared)
+    rest = [n for n in objects if n not in placed]  # objects is in file order
+
+    # Main section (later pages, shared objects, the rest) gets 1..k; the first-page section k+1 on.
+    main = [n for page in pages[1:] for n in private[page]] + shared + rest
+    k = len(main)
+    numbers = {n: i for i, n in enumerate(main, 1)}
+    lin_number = k + 1
+    first_section = [root] + first
+    numbers.update({n: i for i, n in enumerate(first_section, k + 2)})
+    hint_number = k + 2 + len(first_section)
+    size = hint_number + 1
+
+    def body(n):
+        head, stream = _split(objects[n])
+        return b"%d 0 obj" % numbers[n] + _renumber(head, numbers) + stream
+
+    bodies = {n: body(n) for n in objects}
+    first_shared = [n for n in first if len(users[n]) > 1]
+    shared_index = {n: i for i, n in enumerate(first_shared + shared)}
+    page_hints = [(len(first), sum(len(bodies[n]) for n in first), [])]
+    page_hints += [(len(private[page]), sum(len(bodies[n]) for n in private[page]),
+                    [shared_index[n] for n in uses[page] if n in shared_index and n not in private[page]])
+                   for page in pages[1:]]
+
+    def hint_object(page_offset, shared_offset):
+        hints, shared_table = _hint_stream(page_hints, [len(bodies[n]) for n in first_shared],
+                                           [len(bodies[n]) for n in shared], page_offset, shared_offset,
+                                           numbers[shared[0]] if shared else 0)
+        return (b"%d 0 obj\n<< /Length %d /S %d >>\nstream\n" % (hint_number, len(hints), shared_table) + hints
+                + b"\nendstream\nendobj\n")
+
+    ids = re.search(rb"/ID\s*\[[^\]]*\]", trailer)
+    trailer_keys = b"/Root %d 0 R" % numbers[root]
+    if info is not None:
+        trailer_keys += b" /Info %d 0 R" % numbers[info]
+    if ids:
+        trailer_keys += b" " + ids.group(0).replace(b"\n", b"")
+
+    def head_part(values):
+        lin = (b"%d 0 obj\n<< /Linearized 1 /L %0*d /H [ %0*d %0*d ] /O %d /E %0*d /N %d /T %0*d >>\nendobj\n"
+               % (lin_number, _FIELD, values["L"], _FIELD, values["H0"], _FIELD, values["H1"], numbers[pages[0]],
+                  _FIELD, values["E"], len(pages), _FIELD, values["T"]))
+        xref = b"xref\n%d %d\n" % (lin_number, size - lin_number)
+        xref += b"".join(b"%010d 00000 n \n" % values["offsets"].get(n, 0) for n in range(lin_number, size))
+        xref += (b"trailer\n<< /Size %d %s /Prev %0*d >>\nstartxref\n0\n%%%%EOF\n"
+                 % (size, trailer_keys, _FIELD, values["Prev"]))
+        return lin, xref
+
+    def layout(values):
+        lin, xref = head_part(values)
+        offsets = {lin_number: len(header)}
+        out = [header, lin, xref]
+        pos = len(header) + len(lin) + len(xref)
+
+        def put(number, chunk):
+            nonlocal pos
+            offsets[number] = pos
+            out.append(chunk)
+            pos += len(chunk)
+
+        put(numbers[root], bodies[root])
+        hint_at = pos
+        hint = hint_object(values["page"], values["shared"])
+        put(hint_number, hint)
+        page_offset = pos
+        for n in first:
+            put(numbers[n], bodies[n])
+        end_of_first = pos
+        shared_offset = None
+        for n in main:
+            if shared and n == shared[0]:
+                shared_offset = pos
+            put(numbers[n], bodies[n])
+        main_xref = pos
+        xref = b"xref\n0 %d\n0000000000 65535 f \n" % (k + 1)
+        xref += b"".join(b"%010d 00000 n \n" % offsets[numbers[n]] for n in sorted(main, key=numbers.get))
+        xref += b"trailer\n<< /Size %d >>\nstartxref\n%d\n%%%%EOF\n" % (k + 1, len(header) + len(lin))
+        out.append(xref)
+        pos += len(xref)
+        return out, {
+            "L": pos, "H0": hint_at, "H1": len(hint), "E": end_of_first, "Prev": main_xref,
+            "T": main_xref + len(b"xref\n0 %d" % (k + 1)), "offsets": offsets, "page": page_offset,
+            "shared": shared_offset or 0,
+        }
+
+    blank = {"L": 0, "H0": 0, "H1": 0, "E": 0, "Prev": 0, "T": 0, "offsets": {}, "page": 0, "shared": 0}
+    _, values = layout(blank)  # every field is fixed-width, so one dry run finds every offset
+    out, check = layout(values)
+    if check != values:  # not an assert: a mismatch would write wrong offsets into the file
+        raise RuntimeError("linearized layout moved between passes")
+    return b"".join(out)
@@ -0,0 +1,172 @@
+"""
+Font metrics for layout.
+
+Widths are measured once per (text, font) at 1000pt, i.e. in glyph units, and
+scaled to the requested size. Built-in faces have no kerning, so a line's width
+is exactly the sum of its word and space widths.
+
+wrap_text() is built for batch volumes of copy: measure_words() measures a
+paragraph's words in bulk, summing each unseen word with map() over the font's
+width table so the loop over characters runs in C, and lines are then found by
+bisecting the running total of word widths, one step per line rather than one
+per word.
+
+Glyph widths for the built-in Helvetica faces come from font-widths.json, a
+table dumped from reportlab's own metrics by build_width_table(), so layout
+runs without importing reportlab. Characters outside the table fall back to
+reportlab's pdfmetrics, imported on first use. TrueType fonts registered with
+fonts.REGISTRY are measured from the registry's width tables, also without
+reportlab.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+import json
+import os
+
+from .fonts import REGISTRY
+
+WIDTH_CACHE_SIZE = 65536  # strings per font
+WIDTH_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "font-widths.json")
+TABLE_FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique")
+# Printable Latin-1 plus the typographic punctuation and symbols the copy uses.
+TABLE_CHARS = (
+    [chr(i) for i in range(32, 127)]
+    + [chr(i) for i in range(160, 256)]
+    + list("–—‘’‚“”„†‡•…‰‹›€™→←↑↓✦★☆▲◆●")
+)
+
+_word_cache = {}  # font name -> {word: width}, see measure_words()
+_word_counts = [0, 0]  # words looked up, words measured by measure_words(); see width_stats()
+
+
+@lru_cache(maxsize=None)
+def _width_tables():
+    try:
+        with open(WIDTH_TABLE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+@lru_cache(maxsize=4096)
+def _char_units(ch, font_name):
+    from reportlab.pdfbase import pdfmetrics
+
+    return pdfmetrics.stringWidth(ch, font_name, 1000)
+
+
+@lru_cache(maxsize=WIDTH_CACHE_SIZE)
+def text_units(text, font_name):
+    """Width of text in 1/1000 em units (cached LRU)."""
+    table = _width_tables().get(font_name)
+    if table is None:
+        registered = REGISTRY.widths(font_name)
+        if registered is not None:
+            widths, default = registered
+            try:
+                return sum(map(widths.__getitem__, text))
+            except KeyError:  # a character the font has no glyph for
+                return sum(widths.get(ch, default) for ch in text)
+        from reportlab.pdfbase import pdfmetrics
+
+        return pdfmetrics.stringWidth(text, font_name, 1000)
+    try:
+        return sum(map(table.__getitem__, text))
+    except KeyError:  # characters outside the table; measure those with reportlab
+        pass
+    total = 0
+    for ch in text:
+        w = table.get(ch)
+        total += _char_units(ch, font_name) if w is None else w
+    return total
+
+
+def _char_widths(font_name):
+    """{char: width} table for a built-in or registered font, or None."""
+    table = _width_tables().get(font_name)
+    if table is None:
+        registered = REGISTRY.widths(font_name)
+        table = registered and registered[0]
+    return table
+
+
+def _word_units(word, font_name, width):
+    if width is not None:
+        try:
+            return sum(map(width, word))
+        except KeyError:  # characters outside the table
+            pass
+    return text_units.__wrapped__(word, font_name)  # memoized in _word_cache, and counted there
+
+
+def measure_words(words, font_name):
+    """
+    text_units() of each of words, as a list.
+
+    Words are memoized per font in a plain dict, cleared when it fills, rather
+    than an LRU: known words are one map() lookup in C, and only the set of
+    unseen words is measured.
+    """
+    cache = _word_cache.setdefault(font_name, {})
+    missing = set(words).difference(cache)
+    if missing:
+        if len(cache) + len(missing) > WIDTH_CACHE_SIZE:
+            cache.clear()
+            missing = set(words)
+        table = _char_widths(font_name)
+        width = None if table is None else table.__getitem__
+        cache.update((word, _word_units(word, font_name, width)) for word in missing)
+        _word_counts[1] += len(missing)
+    _word_counts[0] += len(words)
+    return list(map(cache.__getitem__, words))
+
+
+def width_stats():
+    """(lookups, misses) so far across text_units() and measure_words(); instrument.Probe counts the deltas."""
+    info = text_units.cache_info()
+    return info.hits + info.misses + _word_counts[0], info.misses + _word_counts[1]
+
+
+def clear_caches():
+    """Forget every measured string, e.g. to time measurement from cold."""
+    text_units.cache_clear()
+    _word_cache.clear()
+
+
+def string_width(text, font_name, font_size):
+    """Drop-in for canvas.stringWidth backed by the width cache."""
+    return text_units(text, font_name) * font_size / 1000
+
+
+def wrap_text(text, max_width, font_name, font_size):
+    """Greedy word-wrap returning list of lines, linear in the length of text."""
+    limit = max_width * 1000 / font_size
+    space = text_units(" ", font_name)
+    words = text.split()
+    # ends[k] is the width of words[:k], each followed by a space, so words[i:j]
+    # fit on a line when ends[j] - ends[i] - space <= limit.
+    ends = list(accumulate((w + space for w in measure_words(words, font_name)), initial=0))
+    lines = []
+    i = 0
+    while i < len(words):
+        j = max(i + 1, bisect_right(ends, ends[i] + limit + space, i + 1) - 1)  # a long word gets a line to itself
+        lines.append(" ".join(words[i:j]))
+        i = j
+    return lines
+
+
+def build_width_table(path=WIDTH_TABLE_PATH):
+    """Regenerate font-widths.json from reportlab's metrics for TABLE_FONTS and TABLE_CHARS."""
+    from reportlab.pdfbase import pdfmetrics
+
+    tables = {
+        font: {ch: pdfmetrics.stringWidth(ch, font, 1000) for ch in TABLE_CHARS}
+        for font in TABLE_FONTS
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tables, f, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+    _width_tables.cache_clear()
+    clear_caches()
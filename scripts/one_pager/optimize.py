@@ -0,0 +1,258 @@
+"""
+Output size optimizations (--optimize) and an account of what each one saves.
+
+reportlab's defaults favour robustness over size. Every stream is ASCII85
+encoded on top of Flate, numbers carry up to six decimals, each form and page
+defines the alpha graphics states it uses inline under names of its own, and
+the file carries producer, creator and date metadata plus generator comments.
+An Optimize tuple turns these off one by one; create_one_pager() and
+create_combined() in render.py take one:
+
+    compress   binary Flate streams: no ASCII85 layer on content, images or fonts
+    gstates    short document-wide ExtGState names, in one shared dictionary when smaller
+    precision  decimals kept on numbers in content streams (None leaves them)
+    metadata   only Title and Author in /Info, and no generator comments
+    linearize  fast web view: first page first, for viewers reading a download as it arrives (see linearize.py)
+    reproducible  pinned dates and a content-derived /ID, so equal input gives equal bytes (see reproducible.py)
+
+Rounding positions one by one would let the error build up along a TextRun,
+whose spans after the first are placed by relative Td moves; precision rounds
+each move so that the running text position stays within half a unit of the
+exact one instead. Font sizes are kept as they are, since every glyph advance
+on a line scales with them.
+
+The first four are the size passes, on by default. linearize is off by
+default; it costs a few hundred bytes of cross-reference and hint tables and
+reorders the file rather than shrinking it. reproducible is on by default and
+changes no sizes. Neither is one of the passes savings() reports.
+
+savings() renders once more per enabled pass, switching them on one at a time,
+so the bytes reported for each are measured rather than estimated.
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+import re
+
+from reportlab import rl_config
+from reportlab.pdfbase import pdfdoc
+
+from .linearize import linearize
+from .reproducible import pin_id
+
+Optimize = namedtuple("Optimize", "compress gstates precision metadata linearize reproducible",
+                      defaults=(True, True, 2, True, False, True))
+NONE = Optimize(False, False, None, False, False, False)  # reportlab's own output
+SIZE_PASSES = ("compress", "gstates", "precision", "metadata")
+
+_GSTATE = re.compile(r"/(gRLs\d+) gs\b")
+_NUM = r"-?(?:\d+\.?\d*|\.\d+)"
+# A font selection, string or name to leave alone (reportlab escapes parentheses inside strings), a text
+# object's start, a text matrix, a relative text move, or a decimal number.
+_TOKEN = re.compile(
+    rf"/[^\s/<>\[\]()]* {_NUM} Tf\b|\((?:\\.|[^\\)])*\)|/[^\s/<>\[\]()]*"
+    r"|(?P<begin>\bBT\b)"
+    rf"|(?P<matrix>(?:{_NUM} ){{4}})(?P<e>{_NUM}) (?P<f>{_NUM}) Tm\b"
+    rf"|(?P<dx>{_NUM}) (?P<dy>{_NUM}) Td\b"
+    r"|(?P<number>-?\d*\.\d+)"
+)
+_DECIMAL = re.compile(r"-?\d*\.\d+")
+_INDIRECT_OVERHEAD = 20  # rough bytes per indirect object (and per reference to one)
+_HEADER_COMMENT = b" ReportLab Generated PDF document (opensource)"
+_ID_COMMENT = b"% ReportLab generated PDF document -- digest (opensource)\n"
+
+
+def _enabled(value):
+    return value is not None and value is not False
+
+
+def _number(text, digits):
+    """text, a PDF number, at most digits decimals in reportlab's style ("-.5", not "-0.50")."""
+    text = f"{float(text):.{digits}f}"
+    if digits:
+        text = text.rstrip("0").rstrip(".")
+    if text.startswith("-"):
+        sign, text = "-", text[1:]
+    else:
+        sign = ""
+    if text.startswith("0.") and len(text) > 2:
+        text = text[1:]
+    return "0" if text in ("0", "") else sign + text
+
+
+def _rounder(digits):
+    """
+    Replacement function for _TOKEN rounding a stream's numbers to digits.
+
+    It follows the text position from BT and Tm through each Td, and rounds a
+    Td to the move from where the rounded stream has put the text so far to
+    where the exact one would, so rounding errors do not add up along a run.
+    """
+    exact = placed = (0.0, 0.0)
+
+    def replace(m):
+        nonlocal exact, placed
+        if m.group("number") is not None:
+            return _number(m.group("number"), digits)
+        if m.group("begin") is not None:
+            exact = placed = (0.0, 0.0)
+        elif m.group("e") is not None:
+            e, f = _number(m.group("e"), digits), _number(m.group("f"), digits)
+            exact, placed = (float(m.group("e")), float(m.group("f"))), (float(e), float(f))
+            matrix = _DECIMAL.sub(lambda n: _number(n.group(0), digits), m.group("matrix"))
+            return f"{matrix}{e} {f} Tm"
+        elif m.group("dx") is not None:
+            exact = (exact[0] + float(m.group("dx")), exact[1] + float(m.group("dy")))
+            dx, dy = (_number(str(to - at), digits) for to, at in zip(exact, placed))
+            placed = (placed[0] + float(dx), placed[1] + float(dy))
+            return f"{dx} {dy} Td"
+        return m.group(0)
+
+    return replace
+
+
+def _rewrite(stream, names, digits):
+    """A content stream with its gs operands renamed per names and its numbers rounded to digits."""
+    if names:
+        stream = _GSTATE.sub(lambda m: f"/{names[m.group(1)]} gs", stream)
+    if digits is not None:
+        stream = _TOKEN.sub(_rounder(digits), stream)
+    return stream
+
+
+def _rewrite_streams(doc, optimize):
+    """Apply the gstates and precision passes to every page and form of doc."""
+    pages = list(doc.Pages.pages)
+    forms = [obj for obj in doc.idToObject.values() if isinstance(obj, pdfdoc.PDFFormXObject)]
+    shared = {}  # (key, value) -> document-wide name
+    used = []  # (holder, [(key, value), ...]) for each page or form with alpha states
+    for obj in pages + forms:
+        holder = getattr(obj, "Resources", None) or obj  # end_form() passes Resources; pages keep ExtGState themselves
+        states = getattr(holder, "ExtGState", None)
+        names = {}
+        if optimize.gstates and states:
+            keys = [tuple(state.dict.items())[0] for state in states.dict.values()]
+            for name, key in zip(states.dict, keys):
+                names[name] = shared.setdefault(key, f"GS{len(shared)}")
+            used.append((holder, keys))
+        if isinstance(obj.stream, bytes):
+            obj.stream = _rewrite(obj.stream.decode("latin-1"), names, optimize.precision).encode("latin-1")
+        else:
+            obj.stream = _rewrite(obj.stream, names, optimize.precision)
+    if not used:
+        return
+    inline = [pdfdoc.PDFDictionary({shared[key]: pdfdoc.PDFDictionary(dict((key,))) for key in keys}) for _, keys in used]
+    states = pdfdoc.PDFDictionary({name: pdfdoc.PDFDictionary(dict((key,))) for key, name in shared.items()})
+    # An indirect object costs its "n 0 obj"/"endobj" lines, a 20-byte xref entry and a reference per user.
+    shared_size = len(states.format(doc)) + _INDIRECT_OVERHEAD * (1 + len(used))
+    if shared_size < sum(len(d.format(doc)) for d in inline):
+        reference = doc.Reference(states, "SharedExtGState")
+        inline = [reference] * len(used)
+    for (holder, _), value in zip(used, inline):
+        holder.ExtGState = value
+
+
+class _LeanInfo(pdfdoc.PDFInfo):
+    """Document info with only what a reader shows: title and author."""
+
+    def format(self, document):
+        return pdfdoc.PDFDictionary({
+            "Title": pdfdoc.PDFString(self.title),
+            "Author": pdfdoc.PDFString(self.author),
+        }).format(document)
+
+
+def _strip_header_comment(data):
+    """data without reportlab's header comment, with the xref offsets moved to match."""
+    start = data.index(b"\n") + 1  # the comment line after %PDF-1.x
+    end = data.index(b"\n", start)
+    if not data[start:end].endswith(_HEADER_COMMENT):
+        return data
+    delta = len(_HEADER_COMMENT)
+    xref = data.rindex(b"\nxref\n") + 1  # everything after here is plain text: xref table and trailer
+    tail = re.sub(rb"(?m)^(\d{10})( \d{5} n )$", lambda m: b"%010d%s" % (int(m.group(1)) - delta, m.group(2)),
+                  data[xref:])
+    tail = re.sub(rb"startxref\n(\d+)", lambda m: b"startxref\n%d" % (int(m.group(1)) - delta), tail)
+    return data[:end - delta] + data[end:xref] + tail
+
+
+@contextmanager
+def optimizing(optimize):
+    """Settings optimize needs while drawing (images are encoded as they are drawn); a no-op for None."""
+    if optimize is None or not optimize.compress:
+        yield
+        return
+    saved = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        yield
+    finally:
+        rl_config.useA85 = saved
+
+
+def from_flags(optimize=False, precision=2, linearize=False, reproducible=False):
+    """The Optimize for the command-line flags of that name, or None when none is given (reportlab's own output)."""
+    options = Optimize(precision=precision) if optimize else None
+    extras = {name: True for name, on in (("linearize", linearize), ("reproducible", reproducible)) if on}
+    return (options or NONE)._replace(**extras) if extras else options
+
+
+def invariant(optimize):
+    """The invariant argument for a reportlab Canvas rendered with optimize (None: reportlab's default)."""
+    return 1 if optimize is not None and optimize.reproducible else None
+
+
+def pdf_data(c, optimize=None):
+    """
+    c.getpdfdata() with optimize's passes applied.
+
+    Call inside optimizing(optimize), on a canvas created with invariant(optimize).
+    """
+    if optimize is None:
+        return c.getpdfdata()
+    if len(c._code):
+        c.showPage()  # as getpdfdata() would, so the last page is there to rewrite
+    doc = c._doc
+    if optimize.gstates or optimize.precision is not None:
+        _rewrite_streams(doc, optimize)
+    if optimize.metadata:
+        info = _LeanInfo()
+        info.title, info.author = doc.info.title, doc.info.author
+        doc.info = info
+        doc._ID = doc.ID().replace(_ID_COMMENT, b"")
+    data = c.getpdfdata()
+    if optimize.metadata:
+        data = _strip_header_comment(data)
+    if optimize.linearize:
+        data = linearize(data)
+    return pin_id(data) if optimize.reproducible else data
+
+
+def savings(render, optimize):
+    """
+    (unoptimized size, [(pass, bytes saved), ...]) for the passes optimize enables.
+
+    render(options) returns PDF bytes for an Optimize. Passes are switched on
+    one at a time in field order, each measured against the one before;
+    linearize and reproducible are left as optimize has them throughout.
+    """
+    options = NONE._replace(linearize=optimize.linearize, reproducible=optimize.reproducible)
+    base = size = len(render(options))
+    saved = []
+    for field in SIZE_PASSES:
+        value = getattr(optimize, field)
+        if not _enabled(value):
+            continue
+        options = options._replace(**{field: value})
+        new_size = len(render(options))
+        saved.append((field, size - new_size))
+        size = new_size
+    return base, saved
+
+
+def format_savings(base, saved):
+    """Report lines for savings(): one per pass, then the total."""
+    total = sum(n for _, n in saved)
+    lines = [f"  {field:<10} {n:>8,} bytes" for field, n in saved]
+    lines.append(f"  {'total':<10} {total:>8,} bytes ({total / base:.0%} of {base / 1024:.1f} KB)")
+    return lines
@@ -0,0 +1,146 @@
+"""
+Image previews of the one-pager: an SVG, and PNG thumbnails at chosen resolutions.
+
+A preview is not converted from the PDF: the laid-out page is drawn by
+render.py's own helpers onto a backends.SvgCanvas or RasterCanvas, so it costs
+one layout and one drawing pass in the process that wants it. Previews are
+cached on disk by input hash (render_key() of the lead and spec plus format,
+resolution and PREVIEW_VERSION), LRU like the PDF cache, and a batch draws them
+across worker processes, each writing its own files:
+
+    python scripts/create-one-pager.py --preview svg --preview png@150
+    python scripts/create-one-pager.py --batch leads.jsonl --preview png@36 --preview png@144
+
+Files are named after the PDF they preview: lighten-ai-one-pager.svg,
+00012-acme-tea-144dpi.png.
+"""
+
+from collections import namedtuple
+from functools import partial
+import hashlib
+import os
+import time
+
+from .backends import RasterCanvas, SvgCanvas
+from .batch import run_pipeline
+from .cache import DEFAULT_MAX_BYTES, RenderCache, render_key
+from .layout import layout_page
+from .leads import lead_filename, normalize_lead, read_leads
+from .render import render_block, write_pdf
+
+Preview = namedtuple("Preview", "fmt dpi")  # dpi is None for svg
+FORMATS = ("svg", "png")
+DEFAULT_DPI = 72
+PREVIEW_VERSION = 1  # bump when backends.py changes what a preview looks like for the same page
+PREVIEW_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "one-pager",
+                                 "previews")
+
+_worker_caches = {}  # (cache_dir, fmt) -> RenderCache, one per process
+
+
+def parse_preview(value):
+    """Preview for "svg", "png" or "png@DPI"; ValueError for anything else."""
+    fmt, _, dpi = value.lower().partition("@")
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown preview format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    if fmt == "svg":
+        if dpi:
+            raise ValueError("svg previews are resolution-independent; drop the @DPI")
+        return Preview("svg", None)
+    if not dpi:
+        return Preview("png", DEFAULT_DPI)
+    if not dpi.isdigit() or not 0 < int(dpi) <= 1200:
+        raise ValueError(f"preview DPI must be a whole number from 1 to 1200, got {dpi!r}")
+    return Preview("png", int(dpi))
+
+
+def preview_name(stem, preview):
+    """File name of a preview of the PDF named stem + ".pdf"."""
+    return f"{stem}.svg" if preview.fmt == "svg" else f"{stem}-{preview.dpi}dpi.png"
+
+
+def preview_key(lead, spec, preview):
+    """Cache key of a preview: the render_key() of its input plus format, resolution and PREVIEW_VERSION."""
+    payload = f"{render_key(lead, spec)} {PREVIEW_VERSION} {preview.fmt} {preview.dpi}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def draw_preview(page, preview):
+    """A laid-out Page (see layout_page) as preview's bytes."""
+    if preview.fmt == "svg":
+        c = SvgCanvas(page.width, page.height, page.typeface)
+    else:
+        c = RasterCanvas(page.width, page.height, preview.dpi, page.typeface)
+    for top, block in page.blocks:
+        render_block(c, block, top)
+    return c.getvalue().encode("utf-8") if preview.fmt == "svg" else c.png()
+
+
+def _cache(cache_dir, cache_bytes, fmt):
+    cache = _worker_caches.get((cache_dir, fmt))
+    if cache is None:
+        cache = _worker_caches[cache_dir, fmt] = RenderCache(cache_dir, cache_bytes, "." + fmt)
+    return cache
+
+
+def write_previews(stem, previews, lead=None, spec=None, cache_dir=PREVIEW_CACHE_DIR, cache_bytes=DEFAULT_MAX_BYTES):
+    """
+    Write each Preview of the lead's page next to stem (a path without extension).
+
+    Cached previews are copied out without laying the page out; cache_dir=None
+    draws everything. Returns (path, hit) per preview, hit None without a cache.
+    """
+    page = None
+    written = []
+    for preview in previews:
+        cache = _cache(cache_dir, cache_bytes, preview.fmt) if cache_dir else None
+        key = cache and preview_key(lead, spec, preview)
+        data = cache and cache.get(key)
+        hit = None if cache is None else data is not None
+        if data is None:
+            if page is None:
+                page = layout_page(lead, spec=spec)
+            data = draw_preview(page, preview)
+            if cache:
+                cache.put(key, data)
+        path = preview_name(stem, preview)
+        write_pdf(data, path)
+        written.append((path, hit))
+    return written
+
+
+def _preview_chunk(out_dir, previews, jobs, cache_dir=PREVIEW_CACHE_DIR, cache_bytes=DEFAULT_MAX_BYTES, profile=False,
+                   spec=None, optimize=None):
+    """
+    Worker entry point, in batch._render_chunk()'s shape: write the previews of a chunk of (index, row) pairs.
+
+    A row's hit is True only if every one of its previews came from the cache.
+    Results carry no data, since the files are already written.
+    """
+    results = []
+    for index, row in jobs:
+        start = time.perf_counter()
+        try:
+            lead = normalize_lead(row)
+            stem = os.path.join(out_dir, os.path.splitext(lead_filename(index, lead))[0])
+            hits = [hit for _, hit in write_previews(stem, previews, lead, spec, cache_dir, cache_bytes)]
+            hit = None if cache_dir is None else all(hits)
+            results.append((os.path.basename(stem), None, None, hit, time.perf_counter() - start))
+        except Exception as e:
+            results.append((None, None, f"{type(e).__name__}: {e}", None, time.perf_counter() - start))
+    return results, None
+
+
+def render_previews(leads_path, out_dir, previews, workers=None, chunk_size=32, cache_dir=PREVIEW_CACHE_DIR,
+                    cache_bytes=DEFAULT_MAX_BYTES, spec=None, dead_letter=None):
+    """
+    Write the previews of every lead in leads_path into out_dir, in parallel.
+
+    Runs through batch.run_pipeline(), so chunking, ordering and dead letters
+    work as for PDFs; cache hits and misses count leads whose previews were
+    all cached. Returns a BatchResult.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    task = partial(_preview_chunk, out_dir, tuple(previews))
+    return run_pipeline(read_leads(leads_path), lambda rendered: None, dead_letter, workers, chunk_size, cache_dir,
+                        cache_bytes, spec=spec, task=task)
@@ -0,0 +1,434 @@
+"""
+Drawing pass for the one-pager.
+
+Emits a laid-out Page (see layout.py) to a reportlab canvas and returns the
+PDF bytes. Items are drawn through a StateCanvas, so only real changes of font,
+color and line state reach the content stream, and text goes out as TextRuns
+of one text object each. Sections drawn before are replayed from the fragment
+cache (fragments.py), the static sections of a multi-page document become
+shared Form XObjects, and optimize.py's passes apply to the finished file.
+"""
+
+from functools import lru_cache
+from itertools import chain, islice
+import os
+import time
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.colors import Color
+from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfdoc
+from reportlab.lib.rl_accel import fp_str
+
+from .fonts import load_typeface
+from .fragments import FRAGMENTS
+from .gstate import StateCanvas, color_key
+from .images import IMAGES
+from .layout import Rect, RoundRect, Circle, Line, Text, Feather, Image, layout_page
+from .metrics import string_width, wrap_text
+from .optimize import invariant, optimizing, pdf_data
+from .theme import RGBA, GREEN
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+OUTPUT_PATH = os.path.join(REPO_ROOT, "lighten-ai-one-pager.pdf")
+
+
+@lru_cache(maxsize=256)
+def rl_color(color):
+    """reportlab Color for a theme RGBA; reportlab colors and None pass through."""
+    if isinstance(color, RGBA):
+        return Color(color.r, color.g, color.b, alpha=color.a)
+    return color
+
+
+def draw_rounded_rect(c, x, y, w, h, radius, fill_color=None, stroke_color=None, stroke_width=0.5):
+    """Draw a rounded rectangle, leaving its fill/stroke color and line width set."""
+    if fill_color:
+        c.setFillColor(fill_color)
+    if stroke_color:
+        c.setStrokeColor(stroke_color)
+        c.setLineWidth(stroke_width)
+
+    p = c.beginPath()
+    p.roundRect(x, y, w, h, radius)
+
+    if fill_color and stroke_color:
+        c.drawPath(p, fill=1, stroke=1)
+    elif fill_color:
+        c.drawPath(p, fill=1, stroke=0)
+    elif stroke_color:
+        c.drawPath(p, fill=0, stroke=1)
+
+
+def draw_feather(c, x, y, size=18):
+    """Draw a simple feather icon."""
+    c.saveState()
+    green = rl_color(GREEN)
+    c.setStrokeColor(green)
+    c.setFillColor(green)
+    c.setLineWidth(0.8)
+
+    # Feather shape using bezier curves
+    s = size / 18.0
+    cx, cy = x, y
+
+    # Main quill line
+    c.setLineWidth(1.0 * s)
+    p = c.beginPath()
+    p.moveTo(cx, cy)
+    p.lineTo(cx + 3*s, cy + 16*s)
+    c.drawPath(p, fill=0, stroke=1)
+
+    # Left vane
+    c.setFillColor(Color(0.42, 0.56, 0.44, alpha=0.25))
+    p = c.beginPath()
+    p.moveTo(cx + 3*s, cy + 16*s)
+    p.curveTo(cx - 5*s, cy + 13*s, cx - 4*s, cy + 6*s, cx, cy)
+    c.drawPath(p, fill=1, stroke=0)
+
+    # Right vane
+    c.setFillColor(Color(0.42, 0.56, 0.44, alpha=0.35))
+    p = c.beginPath()
+    p.moveTo(cx + 3*s, cy + 16*s)
+    p.curveTo(cx + 10*s, cy + 12*s, cx + 8*s, cy + 5*s, cx, cy)
+    c.drawPath(p, fill=1, stroke=0)
+
+    # Stroke outline
+    c.setStrokeColor(green)
+    c.setLineWidth(0.6 * s)
+    p = c.beginPath()
+    p.moveTo(cx + 3*s, cy + 16*s)
+    p.curveTo(cx - 5*s, cy + 13*s, cx - 4*s, cy + 6*s, cx, cy)
+    c.drawPath(p, fill=0, stroke=1)
+
+    p = c.beginPath()
+    p.moveTo(cx + 3*s, cy + 16*s)
+    p.curveTo(cx + 10*s, cy + 12*s, cx + 8*s, cy + 5*s, cx, cy)
+    c.drawPath(p, fill=0, stroke=1)
+
+    c.restoreState()
+
+
+class TextRun:
+    """
+    One BT/ET text object for a sequence of positioned text spans.
+
+    drawString() opens a text object per call and the canvas re-selects the
+    font outside it; a run sets font and fill only when they change and moves
+    between spans with relative Td operators, so a paragraph or a bold lead-in
+    followed by regular text is a single text object. On a StateCanvas the run
+    starts from, and leaves behind, the tracked font and fill. Like reportlab's
+    own text objects it does not update the canvas's font bookkeeping used by
+    drawRightString() and friends.
+    """
+
+    def __init__(self, c):
+        self._c = c
+        self._tracked = isinstance(c, StateCanvas)
+        self._font = c.tracked("font") if self._tracked else None
+        self._fill = c.tracked("fill") if self._tracked else None
+        self._t = None
+        self._x = self._y = 0
+
+    def add(self, x, y, text, font_name, font_size, color):
+        """Show text with its baseline starting at (x, y)."""
+        t = self._t
+        if t is None:
+            t = self._t = self._c.beginText(x, y)
+        else:
+            t._code.append(f"{fp_str(x - self._x, y - self._y)} Td")
+        self._x, self._y = x, y
+        font = (font_name, font_size, font_size * 1.2)
+        if font != self._font:
+            t.setFont(font_name, font_size)
+            self._font = font
+        color = rl_color(color)
+        fill = (color_key(color), None)
+        if fill != self._fill:
+            t.setFillColor(color)
+            self._fill = fill
+        t._fontname, t._fontsize = font_name, font_size  # what _textOut encodes with
+        t._textOut(text)
+
+    def draw(self):
+        if self._t is None:
+            return
+        self._c.drawText(self._t)
+        if self._tracked:
+            self._c.assume("font", self._font)
+            self._c.assume("fill", self._fill)
+        self._t = None
+
+
+def text_run(c):
+    """A TextRun on a reportlab canvas, or the backend's own run on another one (see backends.py)."""
+    return c.text_run() if hasattr(c, "text_run") else TextRun(c)
+
+
+def draw_text_wrapped(c, text, x, y, max_width, font_name, font_size, color, leading=None):
+    """Draw wrapped text as one text object, return the y position after the last line."""
+    if leading is None:
+        leading = font_size * 1.35
+    run = text_run(c)
+    for line in wrap_text(text, max_width, font_name, font_size):
+        run.add(x, y, line, font_name, font_size, color)
+        y -= leading
+    run.draw()
+    return y
+
+
+# ─── LAYOUT TREE RENDERING ───
+
+def _draw_rect(c, item, dy):
+    c.setFillColor(rl_color(item.fill))
+    c.rect(item.x, item.y + dy, item.w, item.h, fill=1, stroke=0)
+
+
+def _draw_round_rect(c, item, dy):
+    draw_rounded_rect(c, item.x, item.y + dy, item.w, item.h, item.radius, rl_color(item.fill), rl_color(item.stroke),
+                      item.stroke_width)
+
+
+def _draw_circle(c, item, dy):
+    c.setFillColor(rl_color(item.fill))
+    c.circle(item.x, item.y + dy, item.r, fill=1, stroke=0)
+
+
+def _draw_line(c, item, dy):
+    c.setStrokeColor(rl_color(item.color))
+    c.setLineWidth(item.width)
+    c.setDash(item.dash or ())
+    c.line(item.x1, item.y1 + dy, item.x2, item.y2 + dy)
+
+
+def _draw_text_run(c, items, dy):
+    """Consecutive Text items as one TextRun; aligned x comes from the layout metrics."""
+    run = text_run(c)
+    for item in items:
+        x = item.x
+        if item.align != "left":
+            w = string_width(item.text, item.font, item.size)
+            x -= w / 2 if item.align == "center" else w
+        run.add(x, item.y + dy, item.text, item.font, item.size, item.color)
+    run.draw()
+
+
+def _draw_feather(c, item, dy):
+    draw_feather(c, item.x, item.y + dy, size=item.size)
+
+
+def _draw_image(c, item, dy):
+    # reportlab names the XObject after the file, so each prepared image is embedded once per document
+    path = IMAGES.prepare(item.path, item.w, item.h, item.fit)
+    # reportlab paints images with the fill alpha too; the other backends paint them opaque
+    ext_gstate = getattr(c, "_extgstate", None)
+    translucent = ext_gstate is not None and ext_gstate._d.get("ca", 1) != 1
+    if translucent:
+        c.saveState()
+        c.setFillAlpha(1)
+    c.drawImage(path, item.x, item.y + dy, item.w, item.h, mask="auto", preserveAspectRatio=True)
+    if translucent:
+        c.restoreState()
+
+
+DRAW = {
+    Rect: _draw_rect,
+    RoundRect: _draw_round_rect,
+    Circle: _draw_circle,
+    Line: _draw_line,
+    Feather: _draw_feather,
+    Image: _draw_image,
+}
+
+
+def draw_ops(items):
+    """(draw function, item) pairs for items, with each stretch of Text items as one (_draw_text_run, run) op."""
+    run = []
+    for item in items:
+        if type(item) is Text:
+            run.append(item)
+            continue
+        if run:
+            yield _draw_text_run, run
+            run = []
+        yield DRAW[type(item)], item
+    if run:
+        yield _draw_text_run, run
+
+
+def _draw_items(c, block, top, probe=None):
+    if probe is None:
+        for draw, item in draw_ops(block.items):
+            draw(c, item, top)
+        return
+    for draw, item in draw_ops(block.items):
+        kind = "TextRun" if draw is _draw_text_run else type(item).__name__
+        start = time.perf_counter()
+        draw(c, item, top)
+        probe.item(kind, time.perf_counter() - start)
+
+
+def render_block(c, block, top, probe=None, fragments=None):
+    """
+    Draw a block's items with its top edge at page y = top.
+
+    With a fragments.FragmentCache, a block already drawn from the same state
+    is replayed from its recorded operators instead.
+    """
+    if probe is None:
+        if fragments is None:
+            _draw_items(c, block, top)
+        else:
+            fragments.draw(c, block, top, _draw_items)
+        return
+    with probe.render(block.name, c):
+        if fragments is None:
+            _draw_items(c, block, top, probe)
+        elif fragments.draw(c, block, top, _draw_items, probe):
+            probe.reused(block.name)
+
+
+def static_runs(page):
+    """
+    Split page.blocks into (top, run) pairs, run being a tuple of (offset, Block).
+
+    Consecutive static blocks keep fixed offsets from each other whatever the
+    lead, so each such run becomes a single form; dynamic blocks are runs of one.
+    """
+    runs = []
+    for top, block in page.blocks:
+        prev = runs[-1] if runs else None
+        if block.static and prev and prev[1][-1][1].static:
+            prev[1].append((top - prev[0], block))
+        else:
+            runs.append((top, [(0, block)]))
+    return [(top, tuple(run)) for top, run in runs]
+
+
+def run_form(c, run, page, forms, probe=None, fragments=None):
+    """
+    Name of the Form XObject holding a run of static blocks, compiling it on first use.
+
+    forms maps run -> form name for one document. The form is drawn relative to
+    the run's top edge, so its bbox spans a page above and below the origin.
+    """
+    name = forms.get(run)
+    if name is None:
+        name = f"{run[0][1].name}{len(forms)}"
+        c.beginForm(name, 0, -page.height, page.width, page.height)
+        for offset, block in run:
+            render_block(c, block, offset, probe, fragments)
+        end_form(c)
+        forms[run] = name
+    return name
+
+
+def end_form(c):
+    """
+    c.endForm() with a Resources dict that carries the form's ExtGState and images.
+
+    reportlab's PDFFormXObject only emits fonts and procsets, so the alpha fills
+    (Color(..., alpha=...)) inside a form would reference missing /gs names.
+    Passing Resources also replaces the XObject entry it would have made for
+    images drawn in the form, so that is added back here.
+    """
+    resources = pdfdoc.PDFResourceDictionary()
+    resources.basicFonts()
+    ext_gstate = c._extgstate.getState()
+    if ext_gstate:
+        resources.ExtGState = ext_gstate
+    if c._formsinuse:
+        resources.allProcs()
+        resources.XObject = c._doc.xobjDict(c._formsinuse)
+    c.endForm(Resources=resources)
+
+
+def place_form(c, name, top):
+    c.saveState()
+    c.translate(0, top)
+    c.doForm(name)
+    c.restoreState()
+
+
+def render_page(c, page, forms=None, probe=None, fragments=None):
+    """
+    Emit a laid-out page to the canvas's current page.
+
+    With a forms dict, static blocks (page chrome and lead-independent
+    sections) become Form XObjects that each page references; pass the same
+    dict for every page of a document so they are stored once. Without one
+    (forms=None, a single-page document) everything is drawn inline, since a
+    form nothing else reuses only adds its object and resources. probe is an optional
+    instrument.Probe recording per-section drawing cost; fragments an optional
+    fragments.FragmentCache that lets unchanged blocks skip drawing altogether.
+
+    Drawing goes through a StateCanvas, so the draw helpers can set font and
+    colors before every item and only real changes reach the content stream.
+    """
+    load_typeface(page.typeface)
+    if probe is not None:
+        c = probe.canvas(c)
+        probe.renders += 1
+    c = StateCanvas(c)
+    c.setTitle(page.title)
+    c.setAuthor(page.author)
+    if forms is None:
+        for top, block in page.blocks:
+            render_block(c, block, top, probe, fragments)
+        return
+    for top, run in static_runs(page):
+        if run[0][1].static:
+            place_form(c, run_form(c, run, page, forms, probe, fragments), top)
+        else:
+            render_block(c, run[0][1], top, probe, fragments)
+
+
+def write_pdf(data, output):
+    """Write PDF bytes to a path or a binary file-like object."""
+    if hasattr(output, "write"):
+        output.write(data)
+    else:
+        with open(output, "wb") as f:
+            f.write(data)
+
+
+def create_one_pager(output=OUTPUT_PATH, lead=None, probe=None, spec=None, fragments=FRAGMENTS, optimize=None):
+    """
+    Render the one-pager, personalized with an optional lead dict, and return the PDF bytes.
+
+    output may be a file path, any binary file-like object (BytesIO, a pipe,
+    socket.makefile("wb")), or None to skip writing and just take the bytes.
+    probe is an optional instrument.Probe; spec a spec.Spec (default: the stock page).
+    Sections unchanged since an earlier render in this process are replayed
+    from the process-wide fragment cache; pass fragments=None to draw everything.
+    optimize is an optional optimize.Optimize: size passes, linearization, reproducibility.
+    """
+    with optimizing(optimize):
+        c = canvas.Canvas(None, pagesize=letter, invariant=invariant(optimize))
+        render_page(c, layout_page(lead, probe, spec), probe=probe, fragments=fragments)
+        data = pdf_data(c, optimize)
+    if output is not None:
+        write_pdf(data, output)
+    return data
+
+
+def create_combined(pages, output=None, probe=None, fragments=FRAGMENTS, optimize=None):
+    """
+    Render laid-out pages (see layout_page) as consecutive pages of one PDF and return the bytes.
+
+    Fonts, alpha graphics states and the static chrome forms are document
+    resources, so they are written once however many pages there are. A
+    single page is drawn inline, as by create_one_pager().
+    """
+    pages = iter(pages)
+    first = list(islice(pages, 2))  # pages may be a generator: look ahead far enough to tell
+    with optimizing(optimize):
+        c = canvas.Canvas(None, pagesize=letter, invariant=invariant(optimize))
+        forms = {} if len(first) > 1 else None
+        for page in chain(first, pages):
+            render_page(c, page, forms, probe, fragments)
+            c.showPage()
+        data = pdf_data(c, optimize)
+    if output is not None:
+        write_pdf(data, output)
+    return data
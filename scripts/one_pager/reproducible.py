@@ -0,0 +1,47 @@
+"""
+Reproducible output and content validators: the same input gives the same bytes.
+
+reportlab stamps every document with the time it was made (CreationDate and
+ModDate in /Info) and a file identifier (/ID) seeded from that time, so two
+renders of one lead differ. With Optimize.reproducible the canvas is created
+invariant, which pins the dates to SOURCE_DATE_EPOCH (2000-01-01 when unset),
+and pin_id() replaces the identifier reportlab then writes, the same for
+every document, with a digest of the document itself. Identical documents
+therefore get identical bytes whichever lead or process produced them, and
+different documents still get different IDs. Object order, resource names and
+font subsets already depend only on what is drawn.
+
+etag() is the strong HTTP validator for a document, the same sha256 the
+archive manifest records, so a client, CDN or upload step can tell an
+unchanged one-pager without fetching or sending it.
+"""
+
+import hashlib
+import os
+import re
+
+EPOCH = 946684800  # 2000-01-01T00:00:00Z, reportlab's invariant date
+
+_ID = re.compile(rb"/ID\s*\[<([0-9a-fA-F]{32})><\1>\]")
+
+
+def source_date():
+    """Timestamp for everything a reproducible run writes: SOURCE_DATE_EPOCH, else EPOCH."""
+    value = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    return int(value) if value else EPOCH
+
+
+def pin_id(data):
+    """data with its /ID (both halves, in every trailer) replaced by an MD5 of the document."""
+    digest = hashlib.md5(data, usedforsecurity=False).hexdigest().encode()
+    return _ID.sub(lambda m: m.group(0).replace(m.group(1), digest), data)
+
+
+def digest(data):
+    """Hex sha256 of a document."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def etag(data):
+    """Strong ETag for a document's bytes."""
+    return f'"{digest(data)}"'
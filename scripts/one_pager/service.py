@@ -0,0 +1,406 @@
+"""
+Local HTTP render service: personalized one-pagers on demand without paying
+interpreter start-up and the reportlab import per request.
+
+    python scripts/serve-one-pager.py --port 8765 -j 4
+
+    POST /render    JSON lead body ({"brand_name": ..., "founder": ..., ...}) of
+                    at most MAX_BODY_BYTES, answered with the PDF, written in
+                    chunks as it is sent, 400 for a malformed lead, or 422
+                    when the copy cannot be fitted to one page
+    GET  /one-pager.pdf?brand_name=...
+                    the same render with the lead in the query string (none:
+                    the stock page), for links; answers HEAD and single byte
+                    ranges (Range: bytes=0-65535), so with --linearize a viewer
+                    can show page one before fetching the rest
+    GET  /stats     queue depth, in-flight counts, latency percentiles (JSON)
+    GET  /healthz   "ok" once the pool is warm
+
+Leads arrive from the network, so their screenshot field cannot name any file
+the server can read: it is refused unless the service is started with
+--screenshot-dir, and then only resolves to images inside that directory.
+
+PDFs carry a strong ETag (the sha256 of their bytes, see reproducible.py);
+GET answers a matching If-None-Match with 304 and resumes a range only if
+If-Range still matches. With --reproducible (or --optimize) identical input
+always gives the same bytes, so ETags stay valid across restarts and workers.
+
+Renders run in a pool of worker processes that each import the renderer and
+draw one page before the server starts listening, so the first request costs
+the same as the thousandth. Concurrent requests for the same lead (same
+cache.render_key) share one render: the first submits it and the rest wait on
+its future. With cache_dir, finished renders also go through a RenderCache.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from .cache import DEFAULT_MAX_BYTES, RenderCache, render_key
+from .fonts import preload
+from .layout import FitError, layout_page
+from .leads import normalize_lead
+from .reproducible import etag
+
+LATENCY_WINDOW = 2048  # most recent requests the percentiles cover
+CHUNK_BYTES = 64 * 1024
+MAX_BODY_BYTES = 64 * 1024
+
+_BYTE_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+_worker_spec = _worker_optimize = None  # per worker process, set by _warm_worker
+
+
+def _warm_worker(spec, optimize=None):
+    """Pool initializer: import the renderer and draw once so caches are hot."""
+    global _worker_spec, _worker_optimize
+    from .render import create_one_pager
+
+    _worker_spec, _worker_optimize = spec, optimize
+    create_one_pager(None, None, None, spec, optimize=optimize)
+
+
+def _render(lead):
+    from .render import create_one_pager
+
+    return create_one_pager(None, lead, None, _worker_spec, optimize=_worker_optimize)
+
+
+def byte_range(header, size):
+    """
+    (start, end) inclusive for a Range header on a size-byte body, or None to send it whole.
+
+    Only a single bytes range is honoured; several ranges or another unit get
+    the whole body, which HTTP allows, and so does an invalid range such as
+    one ending before it starts, which HTTP says to ignore. Raises ValueError
+    for a valid range that selects nothing (it starts past the end, or is an
+    empty suffix), to be answered with 416.
+    """
+    match = _BYTE_RANGE.fullmatch((header or "").strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":  # the last n bytes
+        n = int(last)
+        if n == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - n), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(f"range {header!r} not satisfiable for {size} bytes")
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def http_lead(row, screenshot_dir=None):
+    """
+    normalize_lead() for a lead sent over HTTP.
+
+    A screenshot is a path relative to screenshot_dir and has to stay inside
+    it; without a screenshot_dir it is refused. Raises ValueError like
+    normalize_lead().
+    """
+    if isinstance(row, dict) and row.get("screenshot") not in (None, ""):
+        if screenshot_dir is None:
+            raise ValueError("screenshot is not accepted over HTTP (start the service with --screenshot-dir)")
+        root = os.path.realpath(screenshot_dir)
+        path = os.path.realpath(os.path.join(root, str(row["screenshot"])))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError("screenshot must be a path inside the screenshot directory")
+        row = dict(row, screenshot=path)
+    return normalize_lead(row)
+
+
+def etag_matches(header, tag):
+    """Whether an If-None-Match header lists tag ("*" matches anything; weak comparison, as HTTP specifies)."""
+    if header is None:
+        return False
+    candidates = [value.strip().removeprefix("W/") for value in header.split(",")]
+    return "*" in candidates or tag in candidates
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RenderService:
+    """
+    Warm process pool plus request coalescing around create_one_pager().
+
+    render() is thread-safe and returns PDF bytes; the HTTP handler is one
+    client of it, and tests or other servers can call it directly.
+    """
+
+    def __init__(self, workers=None, spec=None, cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES, optimize=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.spec = spec
+        self.optimize = optimize
+        self.cache = RenderCache(cache_dir, cache_bytes) if cache_dir else None
+        preload(spec)  # before forking, so every worker inherits the loaded fonts
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_warm_worker, initargs=(spec, optimize))
+        self._lock = threading.Lock()
+        self._cache_lock = threading.Lock()  # RenderCache counters are not thread-safe
+        self._pending = {}  # render key -> Future shared by coalesced requests
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.active = 0  # requests being served
+        self.coalesced = 0
+        self.renders = 0
+        self.errors = 0
+
+    def warm(self):
+        """Start every worker and wait until each has rendered once."""
+        futures = [self._pool.submit(time.sleep, 0.05) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def render(self, lead):
+        """PDF bytes for a normalized lead dict, sharing any identical render in flight."""
+        start = time.perf_counter()
+        key = render_key(lead, self.spec, self.optimize)
+        with self._lock:
+            self.requests += 1
+            self.active += 1
+        try:
+            data = None
+            if self.cache:
+                with self._cache_lock:
+                    data = self.cache.get(key)
+            if data is None:
+                data = self._coalesced(key, lead).result()
+            return data
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+                self._latencies.append(time.perf_counter() - start)
+
+    def _coalesced(self, key, lead):
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._pending[key] = self._pool.submit(_render, lead)
+            self.renders += 1
+        future.add_done_callback(lambda f: self._finished(key, f))
+        return future
+
+    def _finished(self, key, future):
+        if self.cache and future.exception() is None:
+            with self._cache_lock:
+                self.cache.put(key, future.result())
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            ordered = sorted(self._latencies)
+            in_flight = len(self._pending)
+            stats = {
+                "workers": self.workers,
+                "requests": self.requests,
+                "active_requests": self.active,
+                "in_flight_renders": in_flight,
+                "queue_depth": max(0, in_flight - self.workers),
+                "renders": self.renders,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "latency_ms": {
+                    f"p{int(q * 100)}": _percentile(ordered, q) * 1000 for q in (0.5, 0.9, 0.99)
+                },
+                "latency_samples": len(ordered),
+            }
+        if self.cache:
+            with self._cache_lock:
+                stats["cache"] = self.cache.stats()
+        return stats
+
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = "one-pager/1"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send(200, "application/json", json.dumps(self.service.stats()).encode())
+        elif self.path == "/healthz":
+            self._send(200, "text/plain", b"ok")
+        elif urlsplit(self.path).path == "/one-pager.pdf":
+            self._send_pdf()
+        else:
+            self._send(404, "text/plain", b"not found")
+
+    def do_HEAD(self):
+        if urlsplit(self.path).path == "/one-pager.pdf":
+            self._send_pdf(head=True)
+        else:
+            self._send(404, "text/plain", b"not found", head=True)
+
+    def _send_pdf(self, head=False):
+        """The render for the query-string lead, whole or as the requested byte range."""
+        try:
+            lead = http_lead(dict(parse_qsl(urlsplit(self.path).query)), self.server.screenshot_dir)
+        except (ValueError, TypeError) as e:
+            self._send(400, "text/plain", f"bad request: {e}".encode(), head=head)
+            return
+        data = self._rendered(lead, head)
+        if data is None:
+            return
+        tag = etag(data)
+        if etag_matches(self.headers.get("If-None-Match"), tag):
+            self.send_response(304)
+            self.send_header("ETag", tag)
+            self.end_headers()
+            return
+        # A range only applies to the version the client already has part of (strong comparison).
+        if_range = self.headers.get("If-Range")
+        header = self.headers.get("Range") if if_range in (None, tag) else None
+        try:
+            span = byte_range(header, len(data))
+        except ValueError:
+            self._send(416, "text/plain", b"range not satisfiable", head=head,
+                       headers={"Content-Range": f"bytes */{len(data)}"})
+            return
+        headers = {"Accept-Ranges": "bytes", "ETag": tag}
+        if span is None:
+            self._send(200, "application/pdf", data, head=head, headers=headers)
+            return
+        start, end = span
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        self._send(206, "application/pdf", memoryview(data)[start:end + 1], head=head, headers=headers)
+
+    def _rendered(self, lead, head=False):
+        """PDF bytes for lead, or None once an error response has been sent."""
+        try:
+            return self.service.render(lead)
+        except FitError as e:
+            self._send(422, "text/plain", f"does not fit: {e}".encode(), head=head)
+        except Exception as e:
+            self._send(500, "text/plain", f"render failed: {type(e).__name__}: {e}".encode(), head=head)
+        return None
+
+    def do_POST(self):
+        if self.path != "/render":
+            self._send(404, "text/plain", b"not found")
+            return
+        raw = None
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError(f"bad Content-Length {length}")
+            if length > MAX_BODY_BYTES:
+                raise ValueError(f"body over {MAX_BODY_BYTES} bytes")
+            raw = self.rfile.read(length)
+            body = json.loads(raw or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("body must be a JSON object of lead fields")
+            lead = http_lead(body, self.server.screenshot_dir)
+        except (ValueError, TypeError) as e:
+            # A body left unread would be parsed as the next request on this connection.
+            self.close_connection = raw is None
+            self._send(400, "text/plain", f"bad request: {e}".encode(),
+                       headers={"Connection": "close"} if self.close_connection else None)
+            return
+        data = self._rendered(lead)
+        if data is not None:
+            self._send(200, "application/pdf", data, headers={"ETag": etag(data)})
+
+    def _send(self, status, content_type, data, head=False, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if head:
+            return
+        view = memoryview(data)
+        for offset in range(0, len(view), CHUNK_BYTES):
+            self.wfile.write(view[offset:offset + CHUNK_BYTES])
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(service, host="127.0.0.1", port=8765, verbose=False, screenshot_dir=None):
+    """Serve service over HTTP until interrupted; screenshot_dir is the only place leads may take screenshots from."""
+    server = ThreadingHTTPServer((host, port), RenderHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    server.screenshot_dir = screenshot_dir
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    import argparse
+
+    from .optimize import from_flags
+    from .spec import SpecError, default_spec, load_spec
+
+    parser = argparse.ArgumentParser(description="Serve personalized one-pagers over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument("--spec", help="JSON or YAML page spec to render instead of the stock copy")
+    parser.add_argument("--cache-dir", help="also keep renders in this content-addressed cache")
+    parser.add_argument("--cache-size", type=int, default=512, help="cache size limit in MB before LRU eviction")
+    parser.add_argument("--optimize", action="store_true",
+                        help="serve size-optimized PDFs (binary streams, shared graphics states, rounded numbers)")
+    parser.add_argument("--precision", type=int, default=2,
+                        help="decimals kept by --optimize, 0 or more (default: 2)")
+    parser.add_argument("--linearize", action="store_true",
+                        help="serve linearized (fast web view) PDFs, so viewers can show page one early")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="serve byte-identical PDFs for identical input (on with --optimize), so ETags hold")
+    parser.add_argument("--screenshot-dir",
+                        help="let leads show a store screenshot, given as a path inside this directory "
+                             "(default: leads cannot name one)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+    if args.precision < 0:
+        parser.error(f"--precision must be 0 or more, got {args.precision}")
+
+    try:
+        spec = load_spec(args.spec) if args.spec else default_spec()
+        layout_page(spec=spec)  # workers warm up on the stock page, so it has to fit
+    except (OSError, SpecError, FitError) as e:
+        print(e)
+        return 2
+    optimize = from_flags(args.optimize, args.precision, args.linearize, args.reproducible)
+    service = RenderService(args.workers, spec, args.cache_dir, args.cache_size * 1024 * 1024, optimize)
+    start = time.perf_counter()
+    service.warm()
+    print(f"Warmed {service.workers} workers in {time.perf_counter() - start:.2f}s; "
+          f"serving on http://{args.host}:{args.port}")
+    try:
+        serve(service, args.host, args.port, args.verbose, args.screenshot_dir)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
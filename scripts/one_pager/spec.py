@@ -0,0 +1,195 @@
+"""
+Declarative page spec: the copy the one-pager lays out.
+
+A spec is a JSON (or, with PyYAML installed, YAML) document with one entry per
+section; default-spec.json next to this module is the stock Lighten AI page and
+doubles as the reference for the format. load_spec() validates the whole
+document up front and reports every problem at once with its path, so a bad
+spec fails before any layout or rendering work starts.
+
+An optional "fonts" entry names TrueType files for the page's regular, bold
+and italic text; without it the page is set in the built-in Helvetica faces
+(see fonts.py). header.logo and hero.image optionally place raster images
+(see images.py). File paths are relative to the spec file.
+
+The parsed spec is a tree of namedtuples and tuples: immutable and hashable,
+so layout can cache sections on it and batch workers can receive it pickled.
+Nothing here imports reportlab.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+import json
+import os
+
+DEFAULT_SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default-spec.json")
+
+Header = namedtuple("Header", "brand tagline contact_name contact_lines logo", defaults=(None,))
+Stat = namedtuple("Stat", "value label")
+Hero = namedtuple("Hero", "badge headline headline_accent subtext stats image", defaults=(None,))
+Problem = namedtuple("Problem", "lead text")
+System = namedtuple("System", "title desc flow")
+Systems = namedtuple("Systems", "title items")
+Step = namedtuple("Step", "title desc")
+Steps = namedtuple("Steps", "title items")
+Impacts = namedtuple("Impacts", "title items")
+Quote = namedtuple("Quote", "text attribution")
+Bullet = namedtuple("Bullet", "bold rest")
+Retainer = namedtuple("Retainer", "title left right")
+Contact = namedtuple("Contact", "value label")
+Cta = namedtuple("Cta", "headline subtext contacts")
+Fonts = namedtuple("Fonts", "regular bold italic")  # absolute paths to .ttf files
+Spec = namedtuple(
+    "Spec",
+    "title author header hero problem systems steps impacts quote perfect_for retainer credibility cta fonts",
+    defaults=(None,),
+)
+
+# Field kinds: str, a namedtuple type (a JSON object), or [kind] (a non-empty list).
+FIELDS = {
+    Header: {"brand": str, "tagline": str, "contact_name": str, "contact_lines": [str], "logo": str},
+    Stat: {"value": str, "label": str},
+    Hero: {"badge": str, "headline": str, "headline_accent": str, "subtext": str, "stats": [Stat], "image": str},
+    Problem: {"lead": str, "text": str},
+    System: {"title": str, "desc": str, "flow": str},
+    Systems: {"title": str, "items": [System]},
+    Step: {"title": str, "desc": str},
+    Steps: {"title": str, "items": [Step]},
+    Impacts: {"title": str, "items": [Stat]},
+    Quote: {"text": str, "attribution": str},
+    Bullet: {"bold": str, "rest": str},
+    Retainer: {"title": str, "left": [Bullet], "right": [Bullet]},
+    Contact: {"value": str, "label": str},
+    Cta: {"headline": str, "subtext": str, "contacts": [Contact]},
+    Fonts: {"regular": str, "bold": str, "italic": str},
+    Spec: {
+        "title": str, "author": str, "header": Header, "hero": Hero, "problem": Problem,
+        "systems": Systems, "steps": Steps, "impacts": Impacts, "quote": Quote, "perfect_for": [str],
+        "retainer": Retainer, "credibility": [str], "cta": Cta, "fonts": Fonts,
+    },
+}
+OPTIONAL = {Header: {"logo"}, Hero: {"image"}, Spec: {"fonts"}}  # fields that may be left out; they default to None
+FONT_EXTENSIONS = (".ttf", ".otf")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+
+
+class SpecError(ValueError):
+    """A spec failed validation; errors lists every "path: problem" found."""
+
+    def __init__(self, source, errors):
+        self.source = source
+        self.errors = list(errors)
+        super().__init__(f"{source}: invalid spec\n" + "\n".join(f"  {e}" for e in self.errors))
+
+
+def _build(kind, value, path, errors):
+    """Convert parsed JSON value to kind, appending problems to errors; None if invalid."""
+    if kind is str:
+        if not isinstance(value, str) or not value.strip():
+            errors.append(f"{path}: expected a non-empty string, got {value!r}")
+            return None
+        return value
+    if isinstance(kind, list):
+        if not isinstance(value, list) or not value:
+            errors.append(f"{path}: expected a non-empty list")
+            return None
+        return tuple(_build(kind[0], v, f"{path}[{i}]", errors) for i, v in enumerate(value))
+    if not isinstance(value, dict):
+        errors.append(f"{path}: expected an object with {', '.join(kind._fields)}")
+        return None
+    fields = FIELDS[kind]
+    for key in value.keys() - fields.keys():
+        errors.append(f"{path}.{key}: unknown field")
+    args = []
+    for key, field_kind in fields.items():
+        if key not in value:
+            if key not in OPTIONAL.get(kind, ()):
+                errors.append(f"{path}.{key}: missing")
+            args.append(None)
+        else:
+            args.append(_build(field_kind, value[key], f"{path}.{key}", errors))
+    return kind(*args)
+
+
+def resolve_path(path, base_dir, where, kind, extensions, errors):
+    """path made absolute against base_dir, appending a wrong extension or a missing file to errors."""
+    if path is None:
+        return None
+    path = os.path.abspath(os.path.join(base_dir, os.path.expanduser(path)))
+    if not path.lower().endswith(extensions):
+        errors.append(f"{where}: expected {kind} ({', '.join(extensions)}), got {path}")
+    elif not os.path.isfile(path):
+        errors.append(f"{where}: no such file {path}")
+    return path
+
+
+def _resolve_files(spec, base_dir, errors):
+    """spec with its font and image paths made absolute."""
+    if spec.fonts is not None:
+        spec = spec._replace(fonts=Fonts(*(
+            resolve_path(path, base_dir, f"spec.fonts.{key}", "a TrueType font", FONT_EXTENSIONS, errors)
+            for key, path in zip(Fonts._fields, spec.fonts)
+        )))
+    if spec.header is not None and spec.header.logo is not None:
+        logo = resolve_path(spec.header.logo, base_dir, "spec.header.logo", "an image", IMAGE_EXTENSIONS, errors)
+        spec = spec._replace(header=spec.header._replace(logo=logo))
+    if spec.hero is not None and spec.hero.image is not None:
+        image = resolve_path(spec.hero.image, base_dir, "spec.hero.image", "an image", IMAGE_EXTENSIONS, errors)
+        spec = spec._replace(hero=spec.hero._replace(image=image))
+    return spec
+
+
+def _check(spec, errors):
+    """Cross-field rules the layout relies on."""
+    if spec.problem and spec.problem.lead and spec.problem.text:
+        if not spec.problem.text.startswith(spec.problem.lead):
+            errors.append("spec.problem.text: must start with problem.lead, which is set in bold")
+    if spec.header and spec.header.contact_lines and len(spec.header.contact_lines) > 2:
+        errors.append("spec.header.contact_lines: at most 2 lines fit beside the logo")
+    for i, item in enumerate(spec.perfect_for or ()):
+        if item and item.count("\n") > 1:
+            errors.append(f"spec.perfect_for[{i}]: at most 2 lines (one newline)")
+
+
+def parse_spec(data, source="<spec>", base_dir=None):
+    """
+    Validate an already-parsed spec document and return a Spec, or raise SpecError.
+
+    Relative font and image paths are resolved against base_dir (default: the
+    working directory).
+    """
+    errors = []
+    spec = _build(Spec, data, "spec", errors)
+    if spec is not None:
+        spec = _resolve_files(spec, base_dir or os.getcwd(), errors)
+        _check(spec, errors)
+    if errors:
+        raise SpecError(source, errors)
+    return spec
+
+
+def load_spec(path):
+    """Read and validate a .json, .yaml or .yml spec file."""
+    with open(path, encoding="utf-8") as f:
+        raw = f.read()
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise SpecError(path, ["YAML specs need PyYAML (pip install pyyaml); use JSON instead"]) from None
+        try:
+            data = yaml.safe_load(raw)
+        except yaml.YAMLError as e:
+            raise SpecError(path, [f"not valid YAML: {e}"]) from None
+    else:
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise SpecError(path, [f"not valid JSON: {e}"]) from None
+    return parse_spec(data, path, os.path.dirname(os.path.abspath(path)))
+
+
+@lru_cache(maxsize=None)
+def default_spec():
+    """The stock page, loaded once per process."""
+    return load_spec(DEFAULT_SPEC_PATH)
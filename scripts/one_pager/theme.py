@@ -0,0 +1,38 @@
+"""
+Colors and page geometry shared by the one-pager layout and renderer.
+
+Kept free of reportlab so spec validation and layout can run without it;
+render.py converts these colors to reportlab ones when drawing.
+"""
+
+from collections import namedtuple
+
+RGBA = namedtuple("RGBA", "r g b a", defaults=(1,))
+
+
+def hex_color(value):
+    """RGBA for a "#RRGGBB" string, matching reportlab's HexColor."""
+    v = int(value.lstrip("#"), 16)
+    return RGBA(((v >> 16) & 0xFF) / 255, ((v >> 8) & 0xFF) / 255, (v & 0xFF) / 255)
+
+
+# ─── COLORS ───
+GREEN = hex_color("#6B8F71")
+GREEN_DARK = hex_color("#5A7D60")
+GREEN_LIGHT = hex_color("#E8F5E9")
+GREEN_BG = hex_color("#F4F9F5")
+TEXT_DARK = hex_color("#1C1C1C")
+TEXT_MUTED = hex_color("#666666")
+TEXT_LIGHT = hex_color("#888888")
+BG_PAGE = hex_color("#FAFAF8")
+BORDER = hex_color("#E8E6E1")
+WHITE = hex_color("#FFFFFF")
+WARM_BG = hex_color("#F9FBF5")
+
+# ─── PAGE SETUP ───
+WIDTH, HEIGHT = 612.0, 792.0  # letter
+MARGIN_LEFT = 36
+MARGIN_RIGHT = 36
+MARGIN_TOP = 36
+MARGIN_BOTTOM = 28
+CONTENT_WIDTH = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
@@ -0,0 +1,262 @@
+"""
+Watch mode (--watch): re-render the one-pager every time its inputs change.
+
+A cold run spends most of its time importing reportlab and loading fonts
+before any page is laid out. watch() pays for that once and then polls the
+page's inputs:
+
+    the spec file (default-spec.json without --spec) and the font and image files it names
+    the package's modules, e.g. theme.py's MARGIN_* and colors or layout.py's section heights
+
+A burst of changes (an editor's write-then-rename, a save-all) has to go
+quiet for DEBOUNCE seconds before it triggers one re-render. An edited module
+is reloaded along with every package module that imports from it, while the
+rest keep their warm state: fonts.REGISTRY and images.IMAGES. Layout's
+per-section caches and fragments.FRAGMENTS are kept across spec edits, so
+those redo only the sections whose inputs changed, but emptied on any reload:
+they hold what the old code laid out and drew. A save that changes nothing
+(same render_key(), no code reloaded) is not re-rendered at all. The PDF and
+any previews replace the old files atomically, so a viewer that reloads on
+change never reads a half-written file.
+"""
+
+import ast
+from importlib import import_module, reload
+import os
+import sys
+import time
+import traceback
+
+POLL_INTERVAL = 0.02  # seconds between checks of the watched files
+DEBOUNCE = 0.05  # quiet time after the last change before re-rendering
+
+PACKAGE = __package__
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_NOT_RELOADED = {PACKAGE, __name__}  # the package's lazy exports are reset instead; this loop keeps running
+
+_imports = {}  # module file -> (stamp, package modules it imports)
+
+
+def _module(name):
+    """The current one_pager.<name> module; looked up on every use since reloads replace module contents."""
+    return import_module(f".{name}", PACKAGE)
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None  # mid-save: some editors delete and re-create the file
+    return st.st_mtime_ns, st.st_size
+
+
+def watched_files(spec_path, spec):
+    """Every file whose change can change the page: the spec, its fonts and images, the package's code."""
+    spec_module = _module("spec")
+    files = {os.path.abspath(spec_path or spec_module.DEFAULT_SPEC_PATH)}
+    if spec is not None:
+        files.update(spec.fonts or ())
+        files.update(path for path in (spec.header.logo, spec.hero.image) if path)
+    files.update(os.path.join(PACKAGE_DIR, name) for name in os.listdir(PACKAGE_DIR) if name.endswith(".py"))
+    return files
+
+
+def _package_imports(name):
+    """
+    Package modules that module name imports from at top level (from .x import ..., from . import x).
+
+    Imports inside functions are left out: they look the module up when they
+    run, so they see a reloaded one anyway. Memoized per file stamp.
+    """
+    path = os.path.join(PACKAGE_DIR, name.rpartition(".")[2] + ".py")
+    stamp = _stamp(path)
+    cached = _imports.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    imported = set()
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.level == 1:
+            if node.module:
+                imported.add(f"{PACKAGE}.{node.module}")
+            else:
+                imported.update(f"{PACKAGE}.{alias.name}" for alias in node.names)
+    _imports[path] = stamp, imported
+    return imported
+
+
+def _import_graph():
+    """{loaded package module: the loaded package modules it imports from}."""
+    loaded = {name for name in sys.modules if name.startswith(PACKAGE + ".") and name not in _NOT_RELOADED}
+    return {name: _package_imports(name) & loaded for name in loaded}
+
+
+def reload_modules(paths):
+    """
+    Reload the loaded package modules among paths and every loaded module depending on them.
+
+    Dependencies are reloaded before their dependents, so a dependent picks up
+    the new names. Returns the reloaded module names, in order.
+    """
+    imports = _import_graph()
+    loaded = imports.keys()
+    stale = {f"{PACKAGE}.{os.path.splitext(os.path.basename(path))[0]}" for path in paths} & loaded
+    while True:
+        more = {name for name, deps in imports.items() if deps & stale} - stale
+        if not more:
+            break
+        stale |= more
+    order = []
+
+    def visit(name):
+        if name in order:
+            return
+        for dep in sorted(imports[name] & stale):
+            visit(dep)
+        order.append(name)
+
+    for name in sorted(stale):
+        visit(name)
+    package = sys.modules[PACKAGE]
+    for name in order:
+        reload(sys.modules[name])
+    for export, module in getattr(package, "_EXPORTS", {}).items():
+        if f"{PACKAGE}.{module}" in stale:
+            vars(package).pop(export, None)  # __getattr__ fetches the reloaded one on next access
+    return order
+
+
+def clear_derived():
+    """Empty the caches of what the package's code produced: layout's section caches and the fragment cache."""
+    _module("fragments").FRAGMENTS.clear()
+    layout = _module("layout")
+    for value in vars(layout).values():
+        if hasattr(value, "cache_clear") and getattr(value, "__module__", None) == layout.__name__:
+            value.cache_clear()
+
+
+def replace_file(data, path):
+    """Write data to path through a temporary file renamed over it, so readers see the old or the new file."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class Watcher:
+    """Warm render loop for one output path; render() once, then run() until interrupted."""
+
+    def __init__(self, spec_path, output, previews=(), optimize=None, log=sys.stdout):
+        self.spec_path = spec_path
+        self.output = output
+        self.previews = tuple(previews)
+        self.optimize = optimize
+        self.log = log
+        self.spec = None
+        self.renders = 0
+        self._key = None  # render_key() of the files on disk
+        self._stamps = {}
+
+    def _scan(self):
+        return {path: _stamp(path) for path in watched_files(self.spec_path, self.spec)}
+
+    def render(self, changed=(), reloaded=False):
+        """Re-render if the inputs changed what the page looks like; report what was done."""
+        start = time.perf_counter()
+        spec_module = _module("spec")
+        if changed:
+            # These memoize by path, and a font or image file may have new contents under the same path.
+            _module("fonts").typeface.cache_clear()
+            _module("cache").spec_fingerprint.cache_clear()
+            if self.spec_path is None and spec_module.DEFAULT_SPEC_PATH in changed:
+                spec_module.default_spec.cache_clear()
+        try:
+            self.spec = spec_module.load_spec(self.spec_path) if self.spec_path else spec_module.default_spec()
+            key = _module("cache").render_key(None, self.spec, self.optimize)
+            if key == self._key and not reloaded:
+                print("No change to the page", file=self.log, flush=True)
+                return
+            fragments = _module("fragments").FRAGMENTS
+            hits, misses = fragments.hits, fragments.misses
+            data = _module("render").create_one_pager(None, spec=self.spec, optimize=self.optimize)
+            replace_file(data, self.output)
+            if self.previews:
+                page = _module("layout").layout_page(spec=self.spec)
+                preview = _module("preview")
+                stem = os.path.splitext(self.output)[0]
+                for options in self.previews:
+                    replace_file(preview.draw_preview(page, options), preview.preview_name(stem, options))
+        except Exception as e:
+            # A half-typed spec or module is normal while editing: keep the last good output and wait.
+            print("".join(traceback.format_exception_only(e)).rstrip(), file=self.log, flush=True)
+            return
+        self._key = key
+        self.renders += 1
+        drawn = fragments.misses - misses
+        sections = drawn + fragments.hits - hits
+        print(f"Rendered {self.output} in {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"({drawn} of {sections} sections drawn, {len(data) / 1024:.1f} KB)", file=self.log, flush=True)
+
+    def _changes(self):
+        """Paths whose stamp differs from the last scan, updating the stamps."""
+        stamps = self._scan()
+        changed = {path for path in stamps.keys() | self._stamps.keys() if stamps.get(path) != self._stamps.get(path)}
+        self._stamps = stamps
+        return changed
+
+    def update(self, changed):
+        """Reload the modules among the changed paths (and their dependents), then render."""
+        names = ", ".join(sorted(os.path.relpath(path) for path in changed))
+        print(f"Changed: {names}", file=self.log, flush=True)
+        code = [path for path in changed if os.path.dirname(path) == PACKAGE_DIR and path.endswith(".py")]
+        reloaded = []
+        if code:
+            try:
+                reloaded = reload_modules(code)
+            except Exception as e:
+                print("".join(traceback.format_exception_only(e)).rstrip(), file=self.log, flush=True)
+                return
+            if reloaded:
+                clear_derived()
+                print(f"Reloaded {', '.join(name.rpartition('.')[2] for name in reloaded)}", file=self.log, flush=True)
+        self.render(changed, bool(reloaded))
+
+    def run(self, poll=POLL_INTERVAL, debounce=DEBOUNCE):
+        """Poll until interrupted, re-rendering after each settled burst of changes."""
+        self._stamps = self._scan()
+        _import_graph()  # parse the modules now rather than on the first edit
+        while True:
+            time.sleep(poll)
+            changed = self._changes()
+            if not changed:
+                continue
+            quiet_since = time.perf_counter()
+            while time.perf_counter() - quiet_since < debounce:
+                time.sleep(poll)
+                more = self._changes()
+                if more:
+                    changed |= more
+                    quiet_since = time.perf_counter()
+            self.update(changed)
+            # The spec may name other fonts or images now; files changed while rendering keep their old
+            # stamps so the next poll still sees them.
+            self._stamps = {path: self._stamps.get(path) or _stamp(path)
+                            for path in watched_files(self.spec_path, self.spec)}
+
+
+def watch(spec_path, output, previews=(), optimize=None, log=sys.stdout):
+    """Render spec_path (None: the stock page) to output, then again on every change, until Ctrl-C."""
+    watcher = Watcher(spec_path, output, previews, optimize, log)
+    watcher.render()
+    print("Watching for changes (Ctrl-C to stop)", file=log, flush=True)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    return watcher
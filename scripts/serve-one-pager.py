@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Serve personalized Lighten AI one-pagers over local HTTP from a warm worker pool.
+
+    python scripts/serve-one-pager.py --port 8765
+    curl -s -X POST localhost:8765/render -d '{"brand_name": "Acme"}' -o acme.pdf
+    curl -s localhost:8765/one-pager.pdf?brand_name=Acme -H "Range: bytes=0-65535" -o head.pdf
+    curl -s localhost:8765/stats
+"""
+
+import sys
+
+from one_pager.service import main
+
+if __name__ == "__main__":
+    sys.exit(main())
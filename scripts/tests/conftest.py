@@ -0,0 +1,8 @@
+"""Test setup: make the one_pager package next to this directory importable, as the scripts do."""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
@@ -0,0 +1,16 @@
+from one_pager.backends import RasterCanvas
+
+
+def dashed(x1, y1, x2, y2):
+    c = RasterCanvas(40, 40)
+    c.setDash((1, 2))
+    c.line(x1, y1, x2, y2)
+    return c.png()
+
+
+def test_zero_length_dashed_line_paints_nothing():
+    assert dashed(10, 10, 10, 10) == RasterCanvas(40, 40).png()
+
+
+def test_dashed_line_paints():
+    assert dashed(5, 10, 35, 10) != RasterCanvas(40, 40).png()
@@ -0,0 +1,24 @@
+import json
+
+from one_pager.batch import render_combined
+
+
+def write_leads(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    return str(path)
+
+
+def test_combined_writes_one_page_per_valid_lead(tmp_path):
+    leads = write_leads(tmp_path / "leads.jsonl", [{"brand_name": "Acme"}, {"brand_name": 42}, {"brand_name": "Bolt"}])
+    output = tmp_path / "all.pdf"
+    result = render_combined(leads, str(output))
+    assert (result.rendered, result.failed) == (2, 1)
+    assert output.read_bytes().count(b"/Type /Page\n") == 2
+
+
+def test_combined_writes_nothing_without_pages(tmp_path):
+    leads = write_leads(tmp_path / "leads.jsonl", [{"brand_name": 42}])
+    output = tmp_path / "all.pdf"
+    result = render_combined(leads, str(output))
+    assert (result.rendered, result.failed) == (0, 1)
+    assert not output.exists()
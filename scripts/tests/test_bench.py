@@ -0,0 +1,24 @@
+from one_pager.bench import _metric, compare
+
+BASELINE = {
+    "render_ms": _metric(10.0, "ms"),
+    "pages_per_s": _metric(100.0, "pages/s", "higher"),
+}
+
+
+def test_compare_flags_only_changes_past_the_threshold():
+    current = {"render_ms": _metric(11.0, "ms"), "pages_per_s": _metric(90.0, "pages/s", "higher")}
+    assert compare(current, BASELINE, 0.15) == []
+
+
+def test_compare_respects_which_direction_is_better():
+    current = {"render_ms": _metric(5.0, "ms"), "pages_per_s": _metric(50.0, "pages/s", "higher")}
+    assert compare(current, BASELINE, 0.15) == [("pages_per_s", 100.0, 50.0, -0.5)]
+    current = {"render_ms": _metric(20.0, "ms"), "pages_per_s": _metric(200.0, "pages/s", "higher")}
+    assert compare(current, BASELINE, 0.15) == [("render_ms", 10.0, 20.0, 1.0)]
+
+
+def test_compare_skips_missing_and_zero_baselines():
+    baseline = dict(BASELINE, cache_ms=_metric(0, "ms"))
+    current = {"cache_ms": _metric(5.0, "ms")}
+    assert compare(current, baseline, 0.15) == []
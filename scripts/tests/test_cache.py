@@ -0,0 +1,40 @@
+import os
+
+from one_pager.cache import RenderCache, render_key
+from one_pager.optimize import Optimize
+
+
+def test_render_key_is_stable_and_covers_its_inputs():
+    lead = {"brand_name": "Acme"}
+    assert render_key(lead) == render_key(dict(lead))
+    assert render_key(None) == render_key({})
+    keys = {
+        render_key(lead),
+        render_key({"brand_name": "Bolt"}),
+        render_key(lead, optimize=Optimize()),
+        render_key(lead, optimize=Optimize(precision=1)),
+    }
+    assert len(keys) == 4
+
+
+def test_get_and_put(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, b"%PDF-1.4 data")
+    assert cache.get("ab" * 32) == b"%PDF-1.4 data"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=250)
+    old, used, new = (f"{i:02d}" * 32 for i in range(3))
+    for age, key in enumerate((old, used)):
+        cache.put(key, b"x" * 100)
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    os.utime(cache._path(used), (900, 900))
+    assert cache.get(used) == b"x" * 100  # a hit makes it the most recently used again
+    cache.put(new, b"x" * 100)  # 300 bytes: evicts down to 90% of 250
+    assert cache.evictions == 1
+    assert cache.get(old) is None
+    assert cache.get(used) == b"x" * 100
+    assert cache.get(new) == b"x" * 100
@@ -0,0 +1,35 @@
+import os
+
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+
+from one_pager import fonts
+from one_pager.fonts import FontRegistry
+
+VERA = os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+
+
+def test_registered_font_loads_from_the_cache(tmp_path):
+    first = FontRegistry(str(tmp_path))
+    name = first.register(VERA)
+    assert first.parsed == 1
+    other = FontRegistry(str(tmp_path))  # another process, as far as the cache can tell
+    assert other.register(VERA) == name
+    assert other.parsed == 0
+    other.load(name)
+    widths, _ = other.widths(name)
+    assert pdfmetrics.stringWidth("A", name, 1000) == widths["A"]
+
+
+def test_cache_entries_are_keyed_on_the_reportlab_version(tmp_path, monkeypatch):
+    FontRegistry(str(tmp_path)).register(VERA)
+    assert all(f"-rl{reportlab.Version}" in entry for entry in os.listdir(tmp_path))
+
+    fonts.cache_tag.cache_clear()
+    monkeypatch.setattr(reportlab, "Version", "0.0.1")
+    try:
+        upgraded = FontRegistry(str(tmp_path))
+        upgraded.register(VERA)
+        assert upgraded.parsed == 1  # the old pickle is not reused
+    finally:
+        fonts.cache_tag.cache_clear()
@@ -0,0 +1,94 @@
+import pytest
+
+from one_pager.layout import (
+    CONTENT_WIDTH, HERO_IMAGE_GAP, HERO_IMAGE_WIDTH, MARGIN_LEFT, MIN_SCALE, FitError, Text, content_bottom, layout_page,
+)
+from one_pager.metrics import string_width
+from one_pager.spec import default_spec
+from one_pager.theme import MARGIN_BOTTOM
+
+LONG_HEADLINE = "We turn every abandoned cart at Extraordinarily Long Brand Name Co into a returning customer"
+
+
+def block(page, name):
+    return next(block for _, block in page.blocks if block.name == name)
+
+
+def right_edge(block):
+    return max(item.x + string_width(item.text, item.font, item.size)
+               for item in block.items if isinstance(item, Text) and item.align == "left")
+
+
+def test_stock_page_fits_as_is():
+    page = layout_page()
+    assert page.fits == ()
+    assert content_bottom(page) >= MARGIN_BOTTOM
+
+
+def test_long_copy_is_shrunk_to_fit():
+    spec = default_spec()
+    spec = spec._replace(quote=spec.quote._replace(text=spec.quote.text * 20))
+    assert content_bottom(layout_page(spec=spec, fit=False)) < MARGIN_BOTTOM
+    page = layout_page(spec=spec)
+    assert page.fits
+    assert content_bottom(page) >= MARGIN_BOTTOM - 1e-6
+
+
+def test_unfittable_page_raises():
+    spec = default_spec()
+    spec = spec._replace(quote=spec.quote._replace(text=spec.quote.text * 80))
+    with pytest.raises(FitError) as info:
+        layout_page(spec=spec)
+    assert info.value.overflow > 0
+
+
+@pytest.mark.parametrize("image", [None, "store.png"])
+def test_long_headline_wraps_within_the_copy_width(image):
+    lead = {"headline": LONG_HEADLINE, "headline_accent": LONG_HEADLINE, "screenshot": image}
+    hero = block(layout_page(lead), "hero")
+    text_w = CONTENT_WIDTH - (HERO_IMAGE_WIDTH + HERO_IMAGE_GAP if image else 0)
+    assert right_edge(hero) <= MARGIN_LEFT + text_w + 1e-6
+    assert hero.overhang == 0
+
+
+def test_unbreakable_word_shrinks_the_type():
+    page = layout_page({"headline": "Supercalifragilisticexpialidociousbrandnamesforall", "screenshot": "store.png"})
+    fits = dict(page.fits)
+    assert MIN_SCALE <= fits["hero"].scale < 1
+    assert fits["hero"].leading == 1  # leading does not change widths
+    assert right_edge(block(page, "hero")) <= MARGIN_LEFT + CONTENT_WIDTH - HERO_IMAGE_WIDTH - HERO_IMAGE_GAP + 1e-6
+
+
+def test_horizontal_overflow_that_cannot_be_fixed_raises():
+    with pytest.raises(FitError) as info:
+        layout_page({"headline": "W" * 60})
+    assert info.value.section == "hero"
+    assert info.value.overhang > 0
+
+
+def long_step_title(words):
+    spec = default_spec()
+    (title, desc), *rest = spec.steps.items
+    return spec._replace(steps=spec.steps._replace(items=((title + " and more" * words, desc), *rest)))
+
+
+def test_long_step_title_is_shrunk_to_fit_across():
+    page = layout_page(spec=long_step_title(6))
+    assert dict(page.fits)["columns"].scale < 1
+    assert block(page, "columns").overhang == 0
+    assert right_edge(block(page, "columns")) <= MARGIN_LEFT + CONTENT_WIDTH + 1e-6
+
+
+def test_step_title_too_long_for_the_column_raises():
+    with pytest.raises(FitError) as info:
+        layout_page(spec=long_step_title(20))
+    assert info.value.section == "columns"
+
+
+def test_cta_headline_past_the_contacts_raises():
+    spec = default_spec()
+    spec = spec._replace(cta=spec.cta._replace(headline=spec.cta.headline * 2))
+    with pytest.raises(FitError, match="not auto-fit") as info:
+        layout_page(spec=spec)
+    assert info.value.section == "cta"
+    assert layout_page(spec=spec, fit=False)  # still stacks as-is for --dry-run
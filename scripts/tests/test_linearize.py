@@ -0,0 +1,44 @@
+import re
+
+import pytest
+
+from one_pager.layout import layout_page
+from one_pager.linearize import linearize
+from one_pager.render import create_combined, create_one_pager
+
+_XREF = re.compile(rb"xref\n(\d+) (\d+)\n")
+_DICT = re.compile(rb"/Linearized 1 /L (\d+) /H \[ (\d+) (\d+) \] /O (\d+) /E (\d+) /N (\d+) /T (\d+)")
+
+
+@pytest.fixture(scope="module", params=[1, 3], ids=["one-page", "three-pages"])
+def document(request):
+    pages = [layout_page({"brand_name": f"Brand {i}"}) for i in range(request.param)]
+    data = create_combined(pages, fragments=None) if request.param > 1 else create_one_pager(None, fragments=None)
+    return request.param, data
+
+
+def test_linearization_dictionary_leads_the_file(document):
+    count, data = document
+    out = linearize(data)
+    match = _DICT.search(out[:1024])
+    assert match
+    length, _, _, _, _, pages, _ = map(int, match.groups())
+    assert length == len(out)
+    assert pages == count
+
+
+def test_cross_reference_points_at_each_object(document):
+    out = linearize(document[1])
+    tables = list(_XREF.finditer(out))
+    assert len(tables) == 2  # first-page section and the rest
+    for table in tables:
+        start, count = map(int, table.groups())
+        for i in range(count):
+            entry = out[table.end() + 20 * i:table.end() + 20 * i + 20]
+            if entry[17:18] == b"n":
+                assert out.startswith(b"%d 0 obj" % (start + i), int(entry[:10]))
+
+
+def test_linearize_is_idempotent(document):
+    out = linearize(document[1])
+    assert linearize(out) is out
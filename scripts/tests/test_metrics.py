@@ -0,0 +1,50 @@
+import pytest
+
+from one_pager import metrics
+from one_pager.metrics import string_width, width_stats, wrap_text
+
+PARAGRAPHS = [
+    "",
+    "One",
+    "I embed as your fractional AI officer and build AI-powered systems — content engines, customer support "
+    "bots, marketing automation, and operations intelligence — all custom-built for your Shopify store.",
+    "Supercalifragilisticexpialidocious words do not break, so they get a line to themselves.",
+    "  Extra   spaces\tand\nnewlines collapse like str.split()  ",
+]
+
+
+def greedy(text, max_width, font, size):
+    """The obvious word-at-a-time wrap that wrap_text() must agree with."""
+    lines, line = [], ""
+    for word in text.split():
+        trial = f"{line} {word}" if line else word
+        if line and string_width(trial, font, size) > max_width:
+            lines.append(line)
+            line = word
+        else:
+            line = trial
+    return lines + [line] if line else lines
+
+
+@pytest.mark.parametrize("text", PARAGRAPHS)
+@pytest.mark.parametrize("width", [40, 120, 300])
+@pytest.mark.parametrize("font", ["Helvetica", "Helvetica-Bold"])
+def test_wrap_text_matches_greedy_wrap(text, width, font):
+    assert wrap_text(text, width, font, 7.5) == greedy(text, width, font, 7.5)
+
+
+def test_string_width_matches_reportlab():
+    from reportlab.pdfbase import pdfmetrics
+
+    for text in ("Lighten AI", "70% — “quoted” → ✦", "Ünïcödé café"):
+        for font in ("Helvetica", "Helvetica-BoldOblique"):
+            assert string_width(text, font, 9) == pytest.approx(pdfmetrics.stringWidth(text, font, 9))
+
+
+def test_width_stats_count_words_wrap_text_measures():
+    metrics.clear_caches()
+    calls, misses = width_stats()
+    wrap_text("alpha beta gamma alpha", 50, "Helvetica", 8)
+    after_calls, after_misses = width_stats()
+    assert after_calls - calls >= 4  # every word, plus the space width
+    assert after_misses - misses >= 3  # alpha, beta and gamma measured once each
@@ -0,0 +1,54 @@
+import re
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from one_pager.optimize import NONE, Optimize, _rewrite, from_flags
+from one_pager.render import TextRun
+
+_OP = re.compile(r"(-?[\d.]+) (-?[\d.]+) (Td|Tm)")
+
+
+def positions(stream):
+    """Text position after every Tm and Td of a stream with one text object."""
+    x = y = 0.0
+    out = []
+    for a, b, op in _OP.findall(stream):
+        if op == "Tm":
+            x, y = float(a), float(b)
+        else:
+            x, y = x + float(a), y + float(b)
+        out.append((x, y))
+    return out
+
+
+def run_stream():
+    """Content stream of a TextRun of many spans at awkward fractional positions."""
+    c = canvas.Canvas(None)
+    run = TextRun(c)
+    for i in range(40):
+        run.add(36.37 + (i % 3) * 0.45, 700.45 - i * 9.35, f"line {i}", "Helvetica", 6.5, "#333333")
+    run.draw()
+    return "\n".join(c._code)
+
+
+@pytest.mark.parametrize("digits", [0, 1, 2])
+def test_precision_does_not_accumulate_along_a_text_run(digits):
+    stream = run_stream()
+    exact, rounded = positions(stream), positions(_rewrite(stream, {}, digits))
+    assert len(exact) == len(rounded) == 40
+    for (x, y), (rx, ry) in zip(exact, rounded):
+        assert abs(x - rx) <= 0.5 * 10 ** -digits + 1e-9
+        assert abs(y - ry) <= 0.5 * 10 ** -digits + 1e-9
+
+
+def test_precision_keeps_font_sizes_and_strings():
+    stream = "BT /F1 6.5 Tf 1 0 0 1 10.25 20.75 Tm (3.14159 2.5 Td) Tj ET 0.333 w"
+    assert _rewrite(stream, {}, 0) == "BT /F1 6.5 Tf 1 0 0 1 10 21 Tm (3.14159 2.5 Td) Tj ET 0 w"
+
+
+def test_from_flags():
+    assert from_flags() is None
+    assert from_flags(optimize=True, precision=1) == Optimize(precision=1)
+    assert from_flags(linearize=True) == NONE._replace(linearize=True)
+    assert from_flags(reproducible=True) == NONE._replace(reproducible=True)
@@ -0,0 +1,86 @@
+import io
+import os
+import re
+import tarfile
+import zipfile
+
+import pytest
+
+from one_pager.archive import ArchiveWriter
+from one_pager.batch import Rendered, directory_sink
+from one_pager.optimize import from_flags
+from one_pager.render import create_one_pager
+from one_pager.reproducible import digest, etag, pin_id
+
+REPRODUCIBLE = from_flags(reproducible=True)
+
+
+def document_id(data):
+    return re.search(rb"/ID\s*\[<([0-9a-fA-F]{32})>", data).group(1)
+
+
+def test_etag_is_the_quoted_sha256():
+    assert etag(b"pdf") == f'"{digest(b"pdf")}"'
+    assert re.fullmatch(r'"[0-9a-f]{64}"', etag(b"pdf"))
+
+
+def test_pin_id_replaces_both_halves():
+    data = b"trailer << /ID [<" + b"0" * 32 + b"><" + b"0" * 32 + b">] >>"
+    pinned = pin_id(data)
+    assert pinned.count(document_id(pinned)) == 2
+    assert document_id(pinned) != b"0" * 32
+
+
+def test_reproducible_renders_are_byte_identical():
+    first = create_one_pager(None, {"brand_name": "Acme"}, fragments=None, optimize=REPRODUCIBLE)
+    again = create_one_pager(None, {"brand_name": "Acme"}, optimize=REPRODUCIBLE)
+    other = create_one_pager(None, {"brand_name": "Globex"}, optimize=REPRODUCIBLE)
+    assert first == again
+    assert document_id(first) != document_id(other)
+
+
+def rendered(name, data):
+    return Rendered(0, {}, name, data, None, False, 0.0)
+
+
+@pytest.mark.parametrize("fmt", ["zip", "tar", "tar.gz"])
+def test_pinned_archives_are_byte_identical(fmt):
+    outputs = []
+    for _ in range(2):
+        out = io.BytesIO()
+        with ArchiveWriter(out, fmt, mtime=946684800) as archive:
+            archive(rendered("a.pdf", b"%PDF-a"))
+            archive(rendered("b.pdf", b"%PDF-b"))
+        outputs.append(out.getvalue())
+    assert outputs[0] == outputs[1]
+
+
+def test_tar_links_duplicate_documents():
+    out = io.BytesIO()
+    with ArchiveWriter(out, "tar", mtime=0) as archive:
+        archive(rendered("a.pdf", b"%PDF-same"))
+        archive(rendered("b.pdf", b"%PDF-same"))
+    with tarfile.open(fileobj=io.BytesIO(out.getvalue())) as tar:
+        member = tar.getmember("b.pdf")
+        assert member.type == tarfile.LNKTYPE and member.linkname == "a.pdf"
+        assert tar.extractfile("b.pdf").read() == b"%PDF-same"
+
+
+def test_zip_stores_duplicates_in_full():
+    out = io.BytesIO()
+    with ArchiveWriter(out, "zip", mtime=0) as archive:
+        archive(rendered("a.pdf", b"%PDF-same"))
+        archive(rendered("b.pdf", b"%PDF-same"))
+    with zipfile.ZipFile(io.BytesIO(out.getvalue())) as z:
+        assert z.read("b.pdf") == b"%PDF-same"
+
+
+def test_directory_sink_leaves_unchanged_files_alone(tmp_path):
+    sink = directory_sink(tmp_path)
+    sink(rendered("a.pdf", b"%PDF-a"))
+    path = tmp_path / "a.pdf"
+    os.utime(path, (0, 0))
+    sink(rendered("a.pdf", b"%PDF-a"))
+    assert path.stat().st_mtime == 0
+    sink(rendered("a.pdf", b"%PDF-changed"))
+    assert path.read_bytes() == b"%PDF-changed"
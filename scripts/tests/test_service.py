@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from one_pager.service import byte_range, etag_matches, http_lead
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=900-", (900, 999)),
+    ("bytes=-50", (950, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=10-5000", (10, 999)),
+    ("bytes=500-100", None),  # invalid: ignored, the whole body is sent
+    ("bytes=0-1,5-9", None),
+    ("items=0-9", None),
+])
+def test_byte_range(header, expected):
+    assert byte_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=2000-3000", "bytes=-0"])
+def test_unsatisfiable_byte_range(header):
+    with pytest.raises(ValueError):
+        byte_range(header, 1000)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('"xyz"', False),
+    ("*", True),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_http_lead_refuses_screenshots_without_a_directory():
+    with pytest.raises(ValueError, match="--screenshot-dir"):
+        http_lead({"brand_name": "Acme", "screenshot": "/etc/passwd"})
+    assert http_lead({"brand_name": "Acme"})["brand_name"] == "Acme"
+
+
+@pytest.mark.parametrize("path", ["../secret.png", "/etc/passwd", "shots/../../secret.png"])
+def test_http_lead_keeps_screenshots_inside_the_directory(tmp_path, path):
+    with pytest.raises(ValueError, match="inside the screenshot directory"):
+        http_lead({"brand_name": "Acme", "screenshot": path}, tmp_path)
+
+
+def test_http_lead_resolves_screenshots_in_the_directory(tmp_path):
+    (tmp_path / "acme.png").write_bytes(b"")
+    lead = http_lead({"brand_name": "Acme", "screenshot": "acme.png"}, tmp_path)
+    assert lead["screenshot"] == os.path.join(os.path.realpath(tmp_path), "acme.png")
+
+
+@pytest.mark.parametrize("row, field", [
+    ({"brand_name": 42}, "brand_name"),
+    ({"headline": ["Grow"]}, "headline"),
+    ({"stats": [["4x", {"label": "Listings"}]]}, "stats"),
+    ({"stats": [["4x"]]}, "stats"),
+    ({"stats": "4x"}, "stats"),
+])
+def test_http_lead_rejects_fields_of_the_wrong_type(row, field):
+    with pytest.raises(ValueError, match=field):
+        http_lead(row)
+
+
+def test_http_lead_accepts_numeric_stats():
+    assert http_lead({"stats": [[4, "Listings"], ["60%", "Fewer tickets"]]})["stats"] == [
+        ("4", "Listings"), ("60%", "Fewer tickets")]
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from one_pager.spec import DEFAULT_SPEC_PATH, SpecError, default_spec, load_spec, parse_spec
+
+
+def stock_data():
+    with open(DEFAULT_SPEC_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_default_spec_loads():
+    spec = default_spec()
+    assert spec.hero.headline
+    assert spec.problem.text.startswith(spec.problem.lead)
+
+
+def test_missing_field_is_reported_with_its_path():
+    data = stock_data()
+    del data["hero"]["headline"]
+    with pytest.raises(SpecError) as info:
+        parse_spec(data)
+    assert any(error.startswith("spec.hero.headline") for error in info.value.errors)
+
+
+def test_cross_field_rules():
+    data = stock_data()
+    data["problem"]["text"] = "Does not start with the lead."
+    data["header"]["contact_lines"] = ["a", "b", "c"]
+    with pytest.raises(SpecError) as info:
+        parse_spec(data)
+    errors = "\n".join(info.value.errors)
+    assert "spec.problem.text" in errors
+    assert "spec.header.contact_lines" in errors
+
+
+def test_image_paths_resolve_against_the_spec_file(tmp_path):
+    (tmp_path / "hero.png").write_bytes(b"")
+    data = stock_data()
+    data["hero"]["image"] = "hero.png"
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    assert load_spec(str(path)).hero.image == str(tmp_path / "hero.png")
+
+    data["hero"]["image"] = "missing.png"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    with pytest.raises(SpecError, match="no such file"):
+        load_spec(str(path))
@@ -0,0 +1,47 @@
+import shutil
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import one_pager
+
+# Runs in a fresh interpreter on a copy of the package, since the test edits its source.
+SCRIPT = textwrap.dedent("""
+    import io, os, sys, time
+    sys.path.insert(0, sys.argv[1])
+    from one_pager.optimize import from_flags
+    from one_pager.watch import Watcher
+
+    opt = from_flags(reproducible=True)
+    out = os.path.join(sys.argv[1], "out.pdf")
+    watcher = Watcher(None, out, optimize=opt, log=io.StringIO())
+    watcher.render()
+    before = open(out, "rb").read()
+
+    path = os.path.join(sys.argv[1], "one_pager", sys.argv[2])
+    source = open(path).read()
+    edited = source.replace(sys.argv[3], sys.argv[4], 1)
+    assert edited != source
+    time.sleep(0.01)
+    with open(path, "w") as f:
+        f.write(edited)
+    watcher.update({path})
+    after = open(out, "rb").read()
+
+    from one_pager import render
+    assert after != before, "output unchanged"
+    assert after == render.create_one_pager(None, fragments=None, optimize=opt), "output differs from a fresh render"
+""")
+
+
+@pytest.mark.parametrize("module, old, new", [
+    ("render.py", "c.setLineWidth(0.8)", "c.setLineWidth(3.7)"),  # fragment cache keyed on unchanged blocks
+    ("theme.py", '"#6B8F71"', '"#8F6B71"'),  # cached section layouts
+])
+def test_reloaded_code_renders_like_a_fresh_process(tmp_path, module, old, new):
+    shutil.copytree(one_pager.__path__[0], tmp_path / "one_pager", ignore=shutil.ignore_patterns("__pycache__"))
+    result = subprocess.run([sys.executable, "-c", SCRIPT, str(tmp_path), module, old, new],
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr